@@ -0,0 +1,95 @@
+"""
+Workforce API - Read-through Cache
+
+Redis-backed cache for hot, rarely-changing reads (tasks and agents by ID).
+When REDIS_URL is not configured every lookup is a miss, so the API behaves
+exactly as if the cache did not exist.
+"""
+
+import hashlib
+import logging
+from typing import Any, Optional
+
+import orjson
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+def task_key(task_id: Any) -> str:
+    return f"task:{task_id}"
+
+
+def agent_key(agent_id: str) -> str:
+    return f"agent:{agent_id}"
+
+
+TASK_LIST_PATTERN = "tasks:list:*"
+
+
+def task_list_key(*params: Any) -> str:
+    """One key per combination of list filters"""
+    digest = hashlib.blake2b(orjson.dumps(params), digest_size=12).hexdigest()
+    return f"tasks:list:{digest}"
+
+
+class ReadCache:
+    """JSON values in Redis with a default TTL. Redis failures degrade to misses."""
+
+    def __init__(self, url: Optional[str], ttl_seconds: int = 60):
+        self.ttl_seconds = ttl_seconds
+        self._redis = aioredis.from_url(url) if url else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on miss"""
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(key)
+        except RedisError as e:
+            logger.warning("cache get failed for %s: %s", key, e)
+            return None
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl_seconds: int = None):
+        """Store a value (asyncpg's UUID type falls back to str)"""
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, orjson.dumps(value, default=str), ex=ttl_seconds or self.ttl_seconds)
+        except RedisError as e:
+            logger.warning("cache set failed for %s: %s", key, e)
+
+    async def delete(self, *keys: str):
+        """Invalidate one or more keys"""
+        if self._redis is None or not keys:
+            return
+        try:
+            await self._redis.delete(*keys)
+        except RedisError as e:
+            logger.warning("cache delete failed for %s: %s", keys, e)
+
+    async def delete_matching(self, pattern: str, batch_size: int = 500):
+        """Invalidate every key matching a glob pattern (SCAN + UNLINK, never KEYS)"""
+        if self._redis is None:
+            return
+        try:
+            batch = []
+            async for key in self._redis.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    await self._redis.unlink(*batch)
+                    batch = []
+            if batch:
+                await self._redis.unlink(*batch)
+        except RedisError as e:
+            logger.warning("cache delete failed for %s: %s", pattern, e)
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
@@ -4,14 +4,28 @@ Workforce API - Single Intake Endpoint
 All external requests (Discord, Telegram, UI, webhooks) route through this API.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Header
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import partial
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple, Literal
+from datetime import datetime, timezone
+from itertools import product
+from uuid import UUID
+import asyncio
+import json
+import logging
 import os
 import sys
 
+import anyio
+import asyncpg
+import orjson
+from cachetools import TTLCache
+
 # Add workforce to path for local development
 if os.path.exists('/root/clawd/workforce'):
     sys.path.insert(0, '/root/clawd/workforce')
@@ -19,83 +33,238 @@ if os.path.exists('/root/clawd/workforce'):
     from dotenv import load_dotenv
     load_dotenv('/root/clawd/discord-bot/.env')
 
-from core.database import get_db, TaskStatus, Priority
+from core.database import WorkforceDB, TaskStatus, Priority, build_http_client
+from core.writer import BatchWriter, WriteFailed
+from config import get_api_config
+from api.cache import ReadCache, task_key, agent_key, task_list_key, TASK_LIST_PATTERN
+
+logger = logging.getLogger(__name__)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON responses rendered by orjson (Rust) instead of the stdlib json module"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Decode json/jsonb columns to Python objects and bytea to "\\x..." hex text, like the Supabase client does"""
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(typename, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+    await conn.set_type_codec("bytea", encoder=str, decoder=str, schema="pg_catalog", format="text")
+
+
+async def _probe_database(pool: asyncpg.Pool, timeout: float) -> Dict[str, str]:
+    """Test DB connection"""
+    try:
+        async with pool.acquire(timeout=timeout) as conn:
+            await conn.fetchval("SELECT id FROM workforce_agents LIMIT 1", timeout=timeout)
+        return {"status": "healthy", "database": "connected"}
+    except Exception as e:
+        return {"status": "unhealthy", "database": f"error: {str(e)}"}
+
+
+async def _maintain_partitions(pool: asyncpg.Pool):
+    """Make sure next months' log partitions exist (pg_cron does this daily where installed)"""
+    try:
+        await pool.execute("SELECT workforce_maintain_partitions()")
+    except asyncpg.PostgresError as e:
+        logger.warning("partition maintenance failed: %s", e)
+
+
+async def _audit_id_type(pool: asyncpg.Pool) -> type:
+    """Audit ids are BIGINT identities, except on installs partitioned while they were UUIDs"""
+    column_type = await pool.fetchval(
+        "SELECT format_type(atttypid, NULL) FROM pg_attribute "
+        "WHERE attrelid = 'workforce_audit_log'::regclass AND attname = 'id'"
+    )
+    return int if column_type == "bigint" else UUID
+
+
+async def _health_loop(app: FastAPI, interval: float):
+    """Refresh app.state.health so /health never waits on the database"""
+    while True:
+        await asyncio.sleep(interval)
+        app.state.health = await _probe_database(app.state.pool, timeout=interval)
+
+
+def _utc_timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+async def _clock_loop(app: FastAPI):
+    """Refresh app.state.health_ts once a second so /health doesn't format a datetime per call"""
+    while True:
+        await asyncio.sleep(1)
+        app.state.health_ts = _utc_timestamp()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the Postgres pool, cache and batch writers on startup, drain and close them on shutdown"""
+    config = get_api_config()
+    if not config.database_url:
+        raise ValueError("DATABASE_URL is required")
+    
+    async with AsyncExitStack() as stack:
+        # Each resource registers its cleanup as soon as it exists, so a failed
+        # startup closes whatever was already opened, in reverse order
+        # Mutations still use the sync Supabase client via run_db
+        anyio.to_thread.current_default_thread_limiter().total_tokens = config.threadpool_size
+        app.state.http_client = build_http_client(
+            max_connections=config.supabase_max_connections,
+            max_keepalive=config.supabase_max_keepalive,
+            timeout=config.supabase_timeout_seconds
+        )
+        stack.callback(app.state.http_client.close)
+        app.state.db = WorkforceDB(http_client=app.state.http_client)
+        
+        app.state.pool = await asyncpg.create_pool(
+            config.database_url,
+            min_size=config.db_pool_min_size,
+            max_size=config.db_pool_max_size,
+            max_inactive_connection_lifetime=config.db_pool_recycle_seconds,
+            command_timeout=config.db_command_timeout_seconds,
+            statement_cache_size=config.db_statement_cache_size,
+            init=_init_connection
+        )
+        stack.push_async_callback(app.state.pool.close)
+        app.state.cache = ReadCache(config.redis_url, ttl_seconds=config.cache_ttl_seconds)
+        stack.push_async_callback(app.state.cache.close)
+        await _maintain_partitions(app.state.pool)
+        app.state.audit_id_type = await _audit_id_type(app.state.pool)
+        
+        async def invalidate_task_lists(written):
+            if "workforce_tasks" in written:
+                await app.state.cache.delete_matching(TASK_LIST_PATTERN)
+        
+        app.state.writer = BatchWriter(
+            app.state.pool,
+            batch_size=config.write_batch_size,
+            flush_interval=config.write_flush_interval_ms / 1000,
+            on_flush=invalidate_task_lists
+        )
+        app.state.writer.start()
+        stack.push_async_callback(app.state.writer.stop)
+        
+        app.state.health = await _probe_database(app.state.pool, timeout=config.health_interval_seconds)
+        app.state.health_ts = _utc_timestamp()
+        health_tasks = [
+            asyncio.create_task(_health_loop(app, config.health_interval_seconds)),
+            asyncio.create_task(_clock_loop(app))
+        ]
+        
+        async def stop_health_tasks():
+            for task in health_tasks:
+                task.cancel()
+            await asyncio.gather(*health_tasks, return_exceptions=True)
+        
+        stack.push_async_callback(stop_health_tasks)
+        yield
 
 app = FastAPI(
     title="Archive Workforce API",
     description="Single Intake API for the Archive Workforce system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# CORS
+# CORS (fixed lists so the middleware builds its headers once; preflights cached for a day)
+_api_config = get_api_config()
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=_api_config.cors_origins,
+    # Browsers reject credentials with a wildcard origin, so only send them for an allowlist
+    allow_credentials="*" not in _api_config.cors_origins,
+    allow_methods=["GET", "POST", "PATCH", "OPTIONS"],
+    allow_headers=["Content-Type", "X-Actor"],
+    expose_headers=["X-Next-Cursor"],
+    max_age=_api_config.cors_max_age_seconds,
 )
 
+# Compression (added last so it wraps CORS; deliverable content compresses well)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # ==========================================
 # MODELS
 # ==========================================
 
-class TaskCreate(BaseModel):
+# Literal fields validate by set membership instead of running a regex
+TaskPriority = Literal["P0", "P1", "P2", "P3"]
+TaskState = Literal["BACKLOG", "IN_PROGRESS", "NEEDS_REVIEW", "DONE", "BLOCKED", "CANCELLED"]
+EffortEstimate = Literal["xs", "s", "m", "l", "xl"]
+IntakeSource = Literal["discord", "telegram", "api", "ui", "webhook"]
+AutonomyMode = Literal["advisory", "review_only", "full_autonomy"]
+
+# Actor ids are btree index keys (idx_audit_actor, idx_insights_agent), and
+# btree rejects keys over ~2.7 KB
+MAX_ACTOR_LENGTH = 128
+
+class RequestModel(BaseModel):
+    """Base for request bodies: stripped strings, unknown keys dropped, immutable"""
+    model_config = ConfigDict(str_strip_whitespace=True, extra='ignore', frozen=True)
+
+class TaskCreate(RequestModel):
     title: str = Field(..., min_length=1, max_length=500)
     description: Optional[str] = None
     owner_agent: Optional[str] = None
-    priority: str = Field(default="P2", pattern="^P[0-3]$")
-    tags: List[str] = []
+    priority: TaskPriority = "P2"
+    tags: List[str] = Field(default_factory=list)
     source: str = Field(default="api")
     requires_approval: bool = False
     parent_task_id: Optional[str] = None
     due_at: Optional[str] = None
     impact_score: Optional[int] = Field(default=None, ge=1, le=10)
-    effort_estimate: Optional[str] = Field(default=None, pattern="^(xs|s|m|l|xl)$")
-    external_refs: Optional[Dict[str, Any]] = {}
+    effort_estimate: Optional[EffortEstimate] = None
+    external_refs: Dict[str, Any] = Field(default_factory=dict)
 
-class TaskUpdate(BaseModel):
+class TaskUpdate(RequestModel):
     title: Optional[str] = None
     description: Optional[str] = None
     owner_agent: Optional[str] = None
-    status: Optional[str] = Field(default=None, pattern="^(BACKLOG|IN_PROGRESS|NEEDS_REVIEW|DONE|BLOCKED|CANCELLED)$")
-    priority: Optional[str] = Field(default=None, pattern="^P[0-3]$")
+    status: Optional[TaskState] = None
+    priority: Optional[TaskPriority] = None
     tags: Optional[List[str]] = None
     requires_approval: Optional[bool] = None
     due_at: Optional[str] = None
 
-class DeliverableCreate(BaseModel):
+class DeliverableCreate(RequestModel):
     title: str
     content: str
     content_type: str = "text"
     is_final: bool = False
 
-class InsightCreate(BaseModel):
+class DeliverableBatchQuery(RequestModel):
+    task_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+class InsightCreate(RequestModel):
     content: str
-    task_id: Optional[str] = None
+    task_id: Optional[UUID] = None
     insight_type: str = "observation"
 
-class IntakeMessage(BaseModel):
+class IntakeMessage(RequestModel):
     """Universal intake format for all sources"""
     message: str
-    source: str = Field(..., pattern="^(discord|telegram|api|ui|webhook)$")
+    source: IntakeSource
     user_id: Optional[str] = None
     channel_id: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = {}
+    metadata: Dict[str, Any] = Field(default_factory=dict)
 
-class AgentCreate(BaseModel):
+class AgentCreate(RequestModel):
     name: str
     role: str
-    capabilities: List[str] = []
+    capabilities: List[str] = Field(default_factory=list)
     model_config_data: Optional[Dict[str, Any]] = None  # Renamed to avoid Pydantic conflict
     enabled: bool = True
 
-class ApprovalAction(BaseModel):
-    action: str = Field(..., pattern="^(approve|reject)$")
+class ApprovalAction(RequestModel):
+    action: Literal["approve", "reject"]
     reason: Optional[str] = None
 
-class AutonomyGrant(BaseModel):
-    mode: str = Field(..., pattern="^(advisory|review_only|full_autonomy)$")
+class AutonomyGrant(RequestModel):
+    mode: AutonomyMode
     duration_minutes: int = Field(..., ge=1, le=480)  # Max 8 hours
     granted_to: Optional[str] = None
     reason: Optional[str] = None
@@ -104,25 +273,159 @@ class AutonomyGrant(BaseModel):
 # DEPENDENCIES
 # ==========================================
 
-def get_actor(x_actor: str = Header(default="api")):
+async def get_actor(x_actor: str = Header(default="api", min_length=1, max_length=MAX_ACTOR_LENGTH)):
     """Extract actor from header"""
     return x_actor
 
+async def get_workforce_db(request: Request) -> WorkforceDB:
+    """Process-wide WorkforceDB on the shared HTTP pool (async so FastAPI doesn't hop to the threadpool)"""
+    return request.app.state.db
+
+async def get_db_conn(request: Request) -> AsyncIterator[asyncpg.Connection]:
+    """Borrow a pooled Postgres connection for the duration of the request"""
+    async with request.app.state.pool.acquire() as conn:
+        yield conn
+
+async def get_cache(request: Request) -> ReadCache:
+    return request.app.state.cache
+
+async def get_writer(request: Request) -> BatchWriter:
+    return request.app.state.writer
+
+async def _write_rows(writer: BatchWriter, *rows: Tuple[str, Dict]):
+    """Write through the batch writer and wait for the commit, so any worker can read the rows next"""
+    try:
+        await writer.write(*rows)
+    except WriteFailed as e:
+        raise HTTPException(status_code=503 if e.retryable else 422, detail=str(e))
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking WorkforceDB call in the threadpool so the event loop keeps serving"""
+    return await anyio.to_thread.run_sync(partial(fn, *args, **kwargs))
+
+# ==========================================
+# QUERY HELPERS
+# ==========================================
+
+def _query_shapes(
+    table: str,
+    filters: Tuple[str, ...],
+    order_by: str,
+    where: str = None
+) -> Dict[Tuple[bool, ...], str]:
+    """
+    Render one SELECT per combination of present filters.
+    
+    A filter is a column name (equality) or a "column <op>" prefix such as
+    "tags @>". A "(created_at, id) <" row-value filter takes one parameter
+    per column, for keyset cursors. Keeping the SQL text identical for a
+    given shape lets asyncpg reuse its per-connection prepared statement
+    instead of re-parsing on every request.
+    """
+    shapes = {}
+    for mask in product((False, True), repeat=len(filters)):
+        clauses = [where] if where else []
+        params = 0
+        for column, present in zip(filters, mask):
+            if not present:
+                continue
+            if column.startswith("("):
+                width = column.count(",") + 1
+                placeholders = ", ".join(f"${params + i}" for i in range(1, width + 1))
+                params += width
+                clauses.append(f"{column} ({placeholders})")
+            else:
+                params += 1
+                op = "" if " " in column else " ="
+                clauses.append(f"{column}{op} ${params}")
+        where_sql = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        shapes[mask] = f"SELECT * FROM {table}{where_sql} ORDER BY {order_by} LIMIT ${params + 1}"
+    return shapes
+
+# Batch writes share one created_at, so pages order on (created_at, id) to break ties
+_TASK_QUERIES = _query_shapes(
+    "workforce_tasks",
+    ("status", "owner_agent", "priority", "tags @>", "(created_at, id) <"),
+    "created_at DESC, id DESC"
+)
+_INSIGHT_QUERIES = _query_shapes(
+    "workforce_insights", ("task_id", "agent", "(created_at, id) <"), "created_at DESC, id DESC"
+)
+_AUDIT_QUERIES = _query_shapes(
+    "workforce_audit_log",
+    ("entity_type", "entity_id", "event_type", "(created_at, id) <"),
+    "created_at DESC, id DESC"
+)
+_UNPROCESSED_EVENT_QUERIES = _query_shapes(
+    "workforce_events", ("(created_at, id) >",), "created_at, id", where="processed = FALSE"
+)
+_RECENT_EVENT_QUERIES = _query_shapes("workforce_events", ("(created_at, id) <",), "created_at DESC, id DESC")
+
+async def _fetch_shape(
+    conn: asyncpg.Connection,
+    shapes: Dict[Tuple[bool, ...], str],
+    *filters: Any,
+    limit: int
+) -> List[Dict]:
+    """Run the statement matching which filters are set (None values are skipped, tuples spread)"""
+    mask = tuple(value is not None for value in filters)
+    args = []
+    for value in filters:
+        if isinstance(value, tuple):
+            args.extend(value)
+        elif value is not None:
+            args.append(value)
+    rows = await conn.fetch(shapes[mask], *args, limit)
+    return [dict(r) for r in rows]
+
+def _parse_cursor(cursor: Optional[str], id_type: type = UUID) -> Optional[Tuple[datetime, Any]]:
+    """
+    Split an X-Next-Cursor value into (created_at, id), parsing the id as the
+    endpoint's key type. A bare timestamp (the older cursor form) compares
+    against a NULL id, which resumes strictly after that instant as it used to.
+    """
+    if cursor is None:
+        return None
+    created_at, _, row_id = cursor.partition(",")
+    try:
+        created_at = datetime.fromisoformat(created_at)
+        return created_at, id_type(row_id) if row_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
+def _set_next_cursor(response: Response, rows: List[Dict], limit: int):
+    """Full page: hand back the last row's (created_at, id) so the client can keyset-paginate"""
+    if rows and len(rows) == limit:
+        created_at = rows[-1]["created_at"]
+        # Rows served from the cache already hold the ISO string
+        if not isinstance(created_at, str):
+            created_at = created_at.isoformat()
+        response.headers["X-Next-Cursor"] = f"{created_at},{rows[-1]['id']}"
+
+async def _fetch_one(conn: asyncpg.Connection, table: str, column: str, value: Any) -> Optional[Dict]:
+    """SELECT a single row by key"""
+    row = await conn.fetchrow(f"SELECT * FROM {table} WHERE {column} = $1", value)
+    return dict(row) if row else None
+
 # ==========================================
 # ROUTES: INTAKE
 # ==========================================
 
 @app.post("/intake", tags=["Intake"])
-async def intake(message: IntakeMessage, actor: str = Depends(get_actor)):
+async def intake(
+    message: IntakeMessage,
+    actor: str = Depends(get_actor),
+    writer: BatchWriter = Depends(get_writer),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
     """
     Universal intake endpoint.
     Jarvis will process and route to appropriate task.
     """
-    db = get_db()
-    
     # For now, create a task directly
     # In Phase 5, Jarvis will process this
-    task = db.create_task(
+    # Rows are written in the next batch; the task list cache is cleared on flush
+    task, audit_row, event_row = db.build_task_rows(
         title=message.message[:200],
         description=message.message,
         assigned_by=actor,
@@ -133,11 +436,17 @@ async def intake(message: IntakeMessage, actor: str = Depends(get_actor)):
             **message.metadata
         }
     )
+    await _write_rows(
+        writer,
+        ("workforce_tasks", task),
+        ("workforce_audit_log", audit_row),
+        ("workforce_events", event_row)
+    )
     
     return {
         "status": "received",
         "task_id": task["id"],
-        "message": "Task created. Jarvis will route and assign."
+        "message": "Task queued. Jarvis will route and assign."
     }
 
 # ==========================================
@@ -145,10 +454,15 @@ async def intake(message: IntakeMessage, actor: str = Depends(get_actor)):
 # ==========================================
 
 @app.post("/tasks", tags=["Tasks"])
-async def create_task(task: TaskCreate, actor: str = Depends(get_actor)):
+async def create_task(
+    task: TaskCreate,
+    actor: str = Depends(get_actor),
+    cache: ReadCache = Depends(get_cache),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
     """Create a new task"""
-    db = get_db()
-    result = db.create_task(
+    result = await run_db(
+        db.create_task,
         title=task.title,
         description=task.description,
         owner_agent=task.owner_agent,
@@ -163,124 +477,222 @@ async def create_task(task: TaskCreate, actor: str = Depends(get_actor)):
         effort_estimate=task.effort_estimate,
         external_refs=task.external_refs
     )
+    await cache.delete_matching(TASK_LIST_PATTERN)
     return result
 
 @app.get("/tasks", tags=["Tasks"])
 async def list_tasks(
-    status: Optional[str] = None,
+    response: Response,
+    status: Optional[TaskState] = None,
     owner_agent: Optional[str] = None,
-    priority: Optional[str] = None,
-    limit: int = 50
+    priority: Optional[TaskPriority] = None,
+    tag: Optional[List[str]] = Query(None),
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    conn: asyncpg.Connection = Depends(get_db_conn),
+    cache: ReadCache = Depends(get_cache)
 ):
-    """List tasks with optional filters"""
-    db = get_db()
-    return db.get_tasks(status=status, owner_agent=owner_agent, priority=priority, limit=limit)
+    """
+    List tasks with optional filters. Repeat ?tag= to require several tags.
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page.
+    """
+    after = _parse_cursor(cursor)
+    key = task_list_key(status, owner_agent, priority, tag, limit, cursor)
+    tasks = await cache.get(key)
+    if tasks is None:
+        tasks = await _fetch_shape(conn, _TASK_QUERIES, status, owner_agent, priority, tag, after, limit=limit)
+        await cache.set(key, tasks, ttl_seconds=get_api_config().task_list_cache_ttl_seconds)
+    _set_next_cursor(response, tasks, limit)
+    return tasks
 
 @app.get("/tasks/{task_id}", tags=["Tasks"])
-async def get_task(task_id: str):
+async def get_task(
+    task_id: UUID,
+    conn: asyncpg.Connection = Depends(get_db_conn),
+    cache: ReadCache = Depends(get_cache)
+):
     """Get a single task"""
-    db = get_db()
-    task = db.get_task(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    task = await cache.get(task_key(task_id))
+    if task is None:
+        task = await _fetch_one(conn, "workforce_tasks", "id", task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        await cache.set(task_key(task_id), task)
     return task
 
 @app.patch("/tasks/{task_id}", tags=["Tasks"])
-async def update_task(task_id: str, update: TaskUpdate, actor: str = Depends(get_actor)):
+async def update_task(
+    task_id: UUID,
+    update: TaskUpdate,
+    actor: str = Depends(get_actor),
+    cache: ReadCache = Depends(get_cache),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
     """Update a task"""
-    db = get_db()
     try:
-        updates = {k: v for k, v in update.dict().items() if v is not None}
-        result = db.update_task(task_id, actor=actor, **updates)
-        return result
+        updates = update.model_dump(exclude_unset=True, exclude_none=True)
+        result = await run_db(db.update_task, str(task_id), actor=actor, **updates)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await cache.delete(task_key(task_id))
+    await cache.delete_matching(TASK_LIST_PATTERN)
+    return result
 
 @app.post("/tasks/{task_id}/approve", tags=["Tasks"])
-async def approve_task(task_id: str, action: ApprovalAction, actor: str = Depends(get_actor)):
+async def approve_task(
+    task_id: UUID,
+    action: ApprovalAction,
+    actor: str = Depends(get_actor),
+    cache: ReadCache = Depends(get_cache),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
     """Approve or reject a task"""
-    db = get_db()
     if action.action == "approve":
-        return db.approve_task(task_id, actor)
+        result = await run_db(db.approve_task, str(task_id), actor)
     else:
-        return db.reject_task(task_id, actor, action.reason)
+        result = await run_db(db.reject_task, str(task_id), actor, action.reason)
+    await cache.delete(task_key(task_id))
+    await cache.delete_matching(TASK_LIST_PATTERN)
+    return result
 
 # ==========================================
 # ROUTES: DELIVERABLES
 # ==========================================
 
 @app.post("/tasks/{task_id}/deliverables", tags=["Deliverables"])
-async def add_deliverable(task_id: str, deliverable: DeliverableCreate, actor: str = Depends(get_actor)):
+async def add_deliverable(
+    task_id: UUID,
+    deliverable: DeliverableCreate,
+    actor: str = Depends(get_actor),
+    cache: ReadCache = Depends(get_cache),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
     """Add a deliverable to a task"""
-    db = get_db()
-    return db.add_deliverable(
-        task_id=task_id,
+    result = await run_db(
+        db.add_deliverable,
+        task_id=str(task_id),
         title=deliverable.title,
         content=deliverable.content,
         content_type=deliverable.content_type,
         created_by=actor,
         is_final=deliverable.is_final
     )
+    await cache.delete(task_key(task_id))
+    return result
 
 @app.get("/tasks/{task_id}/deliverables", tags=["Deliverables"])
-async def get_deliverables(task_id: str):
+async def get_deliverables(task_id: UUID, conn: asyncpg.Connection = Depends(get_db_conn)):
     """Get deliverables for a task"""
-    db = get_db()
-    return db.get_deliverables(task_id)
+    rows = await conn.fetch(
+        "SELECT * FROM workforce_deliverables WHERE task_id = $1 ORDER BY created_at",
+        task_id
+    )
+    return [dict(r) for r in rows]
+
+@app.post("/tasks/deliverables:batch", tags=["Deliverables"])
+async def get_deliverables_batch(query: DeliverableBatchQuery, conn: asyncpg.Connection = Depends(get_db_conn)):
+    """Get deliverables for many tasks in one query, keyed by task ID"""
+    grouped = {str(task_id): [] for task_id in query.task_ids}
+    rows = await conn.fetch(
+        "SELECT * FROM workforce_deliverables WHERE task_id = ANY($1::uuid[]) ORDER BY created_at",
+        list(grouped)
+    )
+    for r in rows:
+        grouped[str(r["task_id"])].append(dict(r))
+    return grouped
 
 # ==========================================
 # ROUTES: INSIGHTS
 # ==========================================
 
 @app.post("/insights", tags=["Insights"])
-async def add_insight(insight: InsightCreate, actor: str = Depends(get_actor)):
-    """Add an insight (agent observation)"""
-    db = get_db()
-    return db.add_insight(
+async def add_insight(
+    insight: InsightCreate,
+    actor: str = Depends(get_actor),
+    writer: BatchWriter = Depends(get_writer),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
+    """Add an insight (agent observation); written in the next batch, which this waits for"""
+    data, audit_row = db.build_insight_rows(
         agent=actor,
         content=insight.content,
-        task_id=insight.task_id,
+        task_id=str(insight.task_id) if insight.task_id else None,
         insight_type=insight.insight_type
     )
+    await _write_rows(writer, ("workforce_insights", data), ("workforce_audit_log", audit_row))
+    return data
 
 @app.get("/insights", tags=["Insights"])
-async def list_insights(task_id: Optional[str] = None, agent: Optional[str] = None, limit: int = 50):
-    """List insights"""
-    db = get_db()
-    return db.get_insights(task_id=task_id, agent=agent, limit=limit)
+async def list_insights(
+    response: Response,
+    task_id: Optional[UUID] = None,
+    agent: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    conn: asyncpg.Connection = Depends(get_db_conn)
+):
+    """
+    List insights.
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page.
+    """
+    rows = await _fetch_shape(conn, _INSIGHT_QUERIES, task_id, agent, _parse_cursor(cursor), limit=limit)
+    _set_next_cursor(response, rows, limit)
+    return rows
 
 @app.post("/insights/{insight_id}/promote", tags=["Insights"])
-async def promote_insight(insight_id: str, actor: str = Depends(get_actor)):
+async def promote_insight(
+    insight_id: str,
+    actor: str = Depends(get_actor),
+    cache: ReadCache = Depends(get_cache),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
     """Promote an insight to a task (Jarvis only)"""
     if actor != "jarvis":
         raise HTTPException(status_code=403, detail="Only Jarvis can promote insights to tasks")
-    db = get_db()
-    return db.promote_insight_to_task(insight_id, actor)
+    try:
+        task = await run_db(db.promote_insight_to_task, insight_id, actor)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    await cache.delete_matching(TASK_LIST_PATTERN)
+    return task
 
 # ==========================================
 # ROUTES: AGENTS
 # ==========================================
 
 @app.get("/agents", tags=["Agents"])
-async def list_agents(enabled_only: bool = True):
+async def list_agents(enabled_only: bool = True, conn: asyncpg.Connection = Depends(get_db_conn)):
     """List all agents"""
-    db = get_db()
-    return db.get_agents(enabled_only=enabled_only)
+    if enabled_only:
+        rows = await conn.fetch("SELECT * FROM workforce_agents WHERE enabled = TRUE")
+    else:
+        rows = await conn.fetch("SELECT * FROM workforce_agents")
+    return [dict(r) for r in rows]
 
 @app.get("/agents/{agent_id}", tags=["Agents"])
-async def get_agent(agent_id: str):
+async def get_agent(
+    agent_id: str,
+    conn: asyncpg.Connection = Depends(get_db_conn),
+    cache: ReadCache = Depends(get_cache)
+):
     """Get agent details"""
-    db = get_db()
-    agent = db.get_agent(agent_id)
-    if not agent:
-        raise HTTPException(status_code=404, detail="Agent not found")
+    agent = await cache.get(agent_key(agent_id))
+    if agent is None:
+        agent = await _fetch_one(conn, "workforce_agents", "id", agent_id)
+        if not agent:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        await cache.set(agent_key(agent_id), agent)
     return agent
 
 @app.post("/agents", tags=["Agents"])
-async def create_agent(agent: AgentCreate, actor: str = Depends(get_actor)):
+async def create_agent(
+    agent: AgentCreate,
+    actor: str = Depends(get_actor),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
     """Create a new agent"""
-    db = get_db()
-    return db.create_agent(
+    return await run_db(
+        db.create_agent,
         name=agent.name,
         role=agent.role,
         capabilities=agent.capabilities,
@@ -289,95 +701,126 @@ async def create_agent(agent: AgentCreate, actor: str = Depends(get_actor)):
     )
 
 @app.patch("/agents/{agent_id}", tags=["Agents"])
-async def update_agent(agent_id: str, updates: Dict[str, Any], actor: str = Depends(get_actor)):
+async def update_agent(
+    agent_id: str,
+    updates: Dict[str, Any],
+    actor: str = Depends(get_actor),
+    cache: ReadCache = Depends(get_cache),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
     """Update agent configuration"""
-    db = get_db()
-    return db.update_agent(agent_id, **updates)
+    result = await run_db(db.update_agent, agent_id, **updates)
+    await cache.delete(agent_key(agent_id))
+    return result
 
 # ==========================================
 # ROUTES: AUTONOMY
 # ==========================================
 
+# Current mode per agent_id (None = global). Modes last minutes, so a few seconds of staleness is fine.
+_autonomy_modes = TTLCache(maxsize=1024, ttl=_api_config.autonomy_cache_ttl_seconds)
+
 @app.get("/autonomy", tags=["Autonomy"])
-async def get_autonomy_mode(agent_id: Optional[str] = None):
+async def get_autonomy_mode(agent_id: Optional[str] = None, conn: asyncpg.Connection = Depends(get_db_conn)):
     """Get current autonomy mode"""
-    db = get_db()
-    mode = db.get_current_autonomy_mode(agent_id)
+    mode = _autonomy_modes.get(agent_id)
+    if mode is not None:
+        return {"mode": mode}
+    
+    sql = """
+        SELECT mode FROM workforce_autonomy_sessions
+        WHERE starts_at < NOW() AND expires_at > NOW() AND revoked_at IS NULL
+    """
+    if agent_id:
+        mode = await conn.fetchval(
+            sql + " AND (granted_to = $1 OR granted_to IS NULL) ORDER BY created_at DESC LIMIT 1",
+            agent_id
+        )
+    else:
+        mode = await conn.fetchval(sql + " ORDER BY created_at DESC LIMIT 1")
+    mode = _autonomy_modes[agent_id] = mode or "advisory"
     return {"mode": mode}
 
 @app.post("/autonomy", tags=["Autonomy"])
-async def grant_autonomy(grant: AutonomyGrant, actor: str = Depends(get_actor)):
+async def grant_autonomy(
+    grant: AutonomyGrant,
+    actor: str = Depends(get_actor),
+    db: WorkforceDB = Depends(get_workforce_db)
+):
     """Grant time-boxed autonomy"""
-    db = get_db()
-    return db.grant_autonomy(
+    session = await run_db(
+        db.grant_autonomy,
         mode=grant.mode,
         granted_by=actor,
         duration_minutes=grant.duration_minutes,
         granted_to=grant.granted_to,
         reason=grant.reason
     )
+    # A global grant changes the answer for every agent
+    if grant.granted_to is None:
+        _autonomy_modes.clear()
+    else:
+        _autonomy_modes.pop(grant.granted_to, None)
+        _autonomy_modes.pop(None, None)
+    return session
 
 # ==========================================
 # ROUTES: EVENTS & AUDIT
 # ==========================================
 
 @app.get("/events", tags=["Events"])
-async def get_events(processed: Optional[bool] = None, limit: int = 100):
-    """Get events (for event-driven processing)"""
-    db = get_db()
+async def get_events(
+    response: Response,
+    processed: Optional[bool] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    conn: asyncpg.Connection = Depends(get_db_conn)
+):
+    """
+    Get events (for event-driven processing).
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page.
+    """
+    after = _parse_cursor(cursor)
     if processed is False:
-        return db.get_unprocessed_events(limit)
-    # For processed=True or None, return recent events
-    result = db.client.table("workforce_events")\
-        .select("*")\
-        .order("created_at", desc=True)\
-        .limit(limit)\
-        .execute()
-    return result.data
+        rows = await _fetch_shape(conn, _UNPROCESSED_EVENT_QUERIES, after, limit=limit)
+    else:
+        # For processed=True or None, return recent events
+        rows = await _fetch_shape(conn, _RECENT_EVENT_QUERIES, after, limit=limit)
+    _set_next_cursor(response, rows, limit)
+    return rows
 
 @app.get("/audit", tags=["Audit"])
 async def get_audit_log(
+    request: Request,
+    response: Response,
     entity_type: Optional[str] = None,
     entity_id: Optional[str] = None,
     event_type: Optional[str] = None,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    conn: asyncpg.Connection = Depends(get_db_conn)
 ):
-    """Query audit log (read-only)"""
-    db = get_db()
-    query = db.client.table("workforce_audit_log").select("*")
-    
-    if entity_type:
-        query = query.eq("entity_type", entity_type)
-    if entity_id:
-        query = query.eq("entity_id", entity_id)
-    if event_type:
-        query = query.eq("event_type", event_type)
-    
-    result = query.order("created_at", desc=True).limit(limit).execute()
-    return result.data
+    """
+    Query audit log (read-only).
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page.
+    """
+    after = _parse_cursor(cursor, request.app.state.audit_id_type)
+    rows = await _fetch_shape(conn, _AUDIT_QUERIES, entity_type, entity_id, event_type, after, limit=limit)
+    _set_next_cursor(response, rows, limit)
+    return rows
 
 # ==========================================
 # ROUTES: HEALTH
 # ==========================================
 
 @app.get("/health", tags=["System"])
-async def health_check():
-    """Health check endpoint"""
-    db = get_db()
-    try:
-        # Test DB connection
-        db.client.table("workforce_agents").select("id").limit(1).execute()
-        return {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "database": "connected"
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "database": f"error: {str(e)}"
-        }
+async def health_check(request: Request):
+    """Health check endpoint (DB status and timestamp are refreshed in the background)"""
+    return {
+        "status": request.app.state.health["status"],
+        "timestamp": request.app.state.health_ts,
+        "database": request.app.state.health["database"]
+    }
 
 @app.get("/", tags=["System"])
 async def root():
@@ -391,4 +834,16 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    # Multiple workers need the app as an import string; each worker opens its own pool
+    uvicorn.run(
+        "api.main:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8002)),
+        workers=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools",
+        # Errors still go to uvicorn.error; per-request logs and default headers are skipped
+        access_log=False,
+        server_header=False,
+        date_header=False
+    )
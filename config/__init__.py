@@ -1,2 +1,2 @@
 """Workforce Config Package"""
-from .settings import get_config, WorkforceConfig
+from .settings import get_config, get_api_config, reload_config, WorkforceConfig, ApiConfig
@@ -2,6 +2,7 @@
 # All secrets come from environment variables
 
 import os
+import threading
 from typing import Optional
 from dataclasses import dataclass
 
@@ -54,11 +55,102 @@ class WorkforceConfig:
             human_approvers=os.environ.get('WORKFORCE_APPROVERS', '').split(',') if os.environ.get('WORKFORCE_APPROVERS') else []
         )
 
-# Singleton config instance
+@dataclass
+class ApiConfig:
+    """Settings for the Single Intake API process"""
+    
+    # Direct Postgres connection used by the async read path
+    database_url: Optional[str] = None
+    db_pool_min_size: int = 5
+    db_pool_max_size: int = 20
+    db_pool_recycle_seconds: float = 1800  # close connections idle longer than this
+    db_command_timeout_seconds: float = 30
+    # Set to 0 behind PgBouncer / Supavisor in transaction mode (no prepared statements)
+    db_statement_cache_size: int = 100
+    
+    # Worker threads for blocking Supabase client calls
+    threadpool_size: int = 100
+    # Shared keep-alive pool for those calls (one per process)
+    supabase_max_connections: int = 100
+    supabase_max_keepalive: int = 50
+    supabase_timeout_seconds: float = 10
+    
+    # Read-through cache (disabled when unset)
+    redis_url: Optional[str] = None
+    cache_ttl_seconds: int = 60
+    task_list_cache_ttl_seconds: int = 10
+    
+    # Batched fire-and-forget writes (intake, insights, audit, events)
+    write_batch_size: int = 64
+    write_flush_interval_ms: int = 50
+    
+    # Background DB probe backing /health
+    health_interval_seconds: float = 5
+    
+    # In-process memo for GET /autonomy
+    autonomy_cache_ttl_seconds: float = 5
+    
+    # Browser origins allowed to call the API; unset means any origin, without credentials
+    cors_origins: list = None
+    cors_max_age_seconds: int = 86400
+    
+    @classmethod
+    def from_env(cls) -> 'ApiConfig':
+        """Load API settings from environment"""
+        return cls(
+            database_url=os.environ.get('DATABASE_URL'),
+            db_pool_min_size=int(os.environ.get('WORKFORCE_DB_POOL_MIN', 5)),
+            db_pool_max_size=int(os.environ.get('WORKFORCE_DB_POOL_MAX', 20)),
+            db_pool_recycle_seconds=float(os.environ.get('WORKFORCE_DB_POOL_RECYCLE', 1800)),
+            db_command_timeout_seconds=float(os.environ.get('WORKFORCE_DB_COMMAND_TIMEOUT', 30)),
+            db_statement_cache_size=int(os.environ.get('WORKFORCE_DB_STATEMENT_CACHE_SIZE', 100)),
+            threadpool_size=int(os.environ.get('WORKFORCE_THREADPOOL_SIZE', 100)),
+            supabase_max_connections=int(os.environ.get('WORKFORCE_SUPABASE_MAX_CONNECTIONS', 100)),
+            supabase_max_keepalive=int(os.environ.get('WORKFORCE_SUPABASE_MAX_KEEPALIVE', 50)),
+            supabase_timeout_seconds=float(os.environ.get('WORKFORCE_SUPABASE_TIMEOUT', 10)),
+            redis_url=os.environ.get('REDIS_URL'),
+            cache_ttl_seconds=int(os.environ.get('WORKFORCE_CACHE_TTL', 60)),
+            task_list_cache_ttl_seconds=int(os.environ.get('WORKFORCE_TASK_LIST_CACHE_TTL', 10)),
+            write_batch_size=int(os.environ.get('WORKFORCE_WRITE_BATCH_SIZE', 64)),
+            write_flush_interval_ms=int(os.environ.get('WORKFORCE_WRITE_FLUSH_MS', 50)),
+            health_interval_seconds=float(os.environ.get('WORKFORCE_HEALTH_INTERVAL', 5)),
+            autonomy_cache_ttl_seconds=float(os.environ.get('WORKFORCE_AUTONOMY_CACHE_TTL', 5)),
+            cors_origins=[o.strip() for o in os.environ['WORKFORCE_CORS_ORIGINS'].split(',') if o.strip()] if os.environ.get('WORKFORCE_CORS_ORIGINS') else ['*'],
+            cors_max_age_seconds=int(os.environ.get('WORKFORCE_CORS_MAX_AGE', 86400)),
+        )
+
+# Singleton config instances. Reads are a plain global lookup; the lock is only
+# taken to load or swap, and a swap replaces the whole object so readers never
+# see a half-built config.
+_lock = threading.Lock()
 _config: Optional[WorkforceConfig] = None
 
 def get_config() -> WorkforceConfig:
     global _config
-    if _config is None:
-        _config = WorkforceConfig.load()
-    return _config
+    config = _config
+    if config is None:
+        with _lock:
+            if _config is None:
+                _config = WorkforceConfig.load()
+            config = _config
+    return config
+
+_api_config: Optional[ApiConfig] = None
+
+def get_api_config() -> ApiConfig:
+    global _api_config
+    config = _api_config
+    if config is None:
+        with _lock:
+            if _api_config is None:
+                _api_config = ApiConfig.from_env()
+            config = _api_config
+    return config
+
+def reload_config() -> WorkforceConfig:
+    """Re-read the environment and atomically replace both configs"""
+    global _config, _api_config
+    config, api_config = WorkforceConfig.load(), ApiConfig.from_env()
+    with _lock:
+        _config, _api_config = config, api_config
+    return config
@@ -1,2 +1,4 @@
 """Workforce Core Package"""
-from .database import get_db, WorkforceDB, TaskStatus, Priority, EventType
+from .database import get_db, WorkforceDB, AsyncWorkforceDB, TaskStatus, Priority, EventType, DISPATCH_TASK_COLUMNS
+from .writer import BatchWriter, WriteFailed
+from .listener import NotificationListener
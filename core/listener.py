@@ -0,0 +1,122 @@
+"""
+Workforce Notification Listener
+
+Wakes event/task consumers on Postgres NOTIFY (see the workforce_events_notify
+and tasks_status_notify triggers) instead of polling on a fixed interval.
+Notifications are hints: wait() times out so the caller can fall back to a
+regular poll, which also covers anything sent while disconnected.
+
+LISTEN needs a session, so connect directly to Postgres (not through
+PgBouncer / Supavisor in transaction mode). A dropped connection is logged
+and re-established with backoff; the consumer's timeout polls cover the gap.
+
+A dispatcher loop looks like:
+
+    listener = NotificationListener(dsn)
+    await listener.start()
+    while True:
+        await listener.wait(timeout=30)  # hints, or [] on timeout
+        for event in db.claim_unprocessed_events("dispatcher"):
+            ...
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import asyncpg
+import orjson
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "workforce_events"
+TASKS_CHANNEL = "workforce_tasks_changed"
+
+
+class NotificationListener:
+    """LISTEN on one dedicated connection and hand notifications out in batches"""
+
+    def __init__(
+        self,
+        dsn: str,
+        channels: Iterable[str] = (EVENTS_CHANNEL,),
+        max_queued: int = 10000,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0
+    ):
+        self.dsn = dsn
+        self.channels = tuple(channels)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._conn: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self):
+        """Open the connection and subscribe to every channel"""
+        if self._conn is None:
+            self._stopping = False
+            await self._connect()
+
+    async def stop(self):
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+            self._reconnect_task = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    async def _connect(self):
+        conn = await asyncpg.connect(self.dsn)
+        try:
+            for channel in self.channels:
+                await conn.add_listener(channel, self._on_notify)
+        except BaseException:
+            await conn.close()
+            raise
+        conn.add_termination_listener(self._on_terminate)
+        self._conn = conn
+
+    def _on_terminate(self, conn: asyncpg.Connection):
+        if self._stopping or conn is not self._conn:
+            return
+        logger.warning("LISTEN connection lost, reconnecting")
+        self._conn = None
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect(), name="listener-reconnect")
+
+    async def _reconnect(self):
+        """Reconnect and re-LISTEN, backing off until the server is back"""
+        delay = self.retry_delay
+        while not self._stopping:
+            try:
+                await self._connect()
+                logger.info("LISTEN connection re-established")
+                return
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning("LISTEN reconnect failed, retrying in %.0fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+    def _on_notify(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str):
+        try:
+            self._queue.put_nowait((channel, orjson.loads(payload)))
+        except asyncio.QueueFull:
+            # The consumer is behind; its next poll picks these rows up anyway
+            logger.warning("notification queue full, dropping %s hint", channel)
+
+    async def wait(self, timeout: float = 30.0) -> List[Tuple[str, Dict]]:
+        """
+        Wait up to timeout for a notification, then return it with any others
+        already queued. An empty list means the caller should poll.
+        """
+        try:
+            batch = [await asyncio.wait_for(self._queue.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
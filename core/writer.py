@@ -0,0 +1,228 @@
+"""
+Workforce Batch Writer
+
+Coalesces small inserts (insights, intake tasks, audit rows,
+events) into one multi-row INSERT per table per flush instead of one
+round-trip per row.
+
+Each put() is one logical write: its rows (a task with its audit and event
+rows, an insight with its audit row) are committed together with every other
+queued bundle in a single transaction, tables in FK order, so an event never
+lands before its task and an audit row never outlives the row it records.
+
+write() queues a bundle and waits for its batch to commit (a group commit:
+one transaction for every request that arrived within the flush interval),
+so the row exists for any worker once the caller responds. put() alone is
+for rows no one will look up straight away.
+
+WorkforceDB mutations already carry their audit/event rows in the same RPC
+and transaction, so they add no extra round-trip and stay consistent.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# Parents before children: insights reference tasks, events are sent last
+TABLE_ORDER = ("workforce_tasks", "workforce_insights", "workforce_audit_log", "workforce_events")
+
+# Failures that say nothing about the rows (a dropped connection, a failover,
+# a pool timeout, a serialization failure) retry the whole batch; anything
+# else is treated as a bad row and the batch is split to find it
+_TRANSIENT_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.InterfaceError,
+    asyncpg.TransactionRollbackError,
+    asyncpg.CannotConnectNowError,
+)
+
+
+class WriteFailed(Exception):
+    """A bundle was not written; retryable when the database was unreachable rather than the rows rejected"""
+
+    def __init__(self, message: str, retryable: bool):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class _Bundle:
+    """Rows from one request that commit together or not at all"""
+
+    __slots__ = ("rows", "done")
+
+    def __init__(self, rows: Sequence[Tuple[str, Dict]]):
+        self.rows = rows
+        # Resolves to None once committed, or to the WriteFailed that dropped it
+        self.done = asyncio.get_running_loop().create_future()
+
+
+class BatchWriter:
+    """Queue row bundles and flush them in batches, one transaction per batch, from a background task"""
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        tables: Sequence[str] = TABLE_ORDER,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        max_queued: int = 10000,
+        retry_delay: float = 0.1,
+        max_retry_delay: float = 5.0,
+        max_attempts: int = 6,
+        on_flush: Optional[Callable[[Dict[str, List[Dict]]], Awaitable[None]]] = None
+    ):
+        self.pool = pool
+        self.tables = tuple(tables)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max_attempts
+        self.on_flush = on_flush
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def start(self):
+        """Start the background flush loop"""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="batch-writer")
+
+    async def put(self, *rows: Tuple[str, Dict]) -> asyncio.Future:
+        """Queue one logical write as (table, row) pairs; waits only if the queue is full"""
+        for table, _ in rows:
+            if table not in self.tables:
+                raise ValueError(f"BatchWriter does not write {table}")
+        bundle = _Bundle(rows)
+        await self._queue.put(bundle)
+        return bundle.done
+
+    async def write(self, *rows: Tuple[str, Dict]):
+        """Queue one logical write and wait for it to commit; raises WriteFailed if it was dropped"""
+        # Shielded so a client disconnect doesn't cancel the result the flusher settles
+        error = await asyncio.shield(await self.put(*rows))
+        if error is not None:
+            raise error
+
+    async def stop(self):
+        """Write everything already queued (without retrying failures), then stop the flush loop"""
+        if self._task is not None:
+            self._stopping = True
+            await self._queue.put(_STOP)
+            await self._task
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            bundle = await self._queue.get()
+            if bundle is _STOP:
+                return
+
+            # Collect up to batch_size bundles, waiting at most flush_interval
+            batch, stopping = [bundle], False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    bundle = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if bundle is _STOP:
+                    stopping = True
+                    break
+                batch.append(bundle)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, bundles: List[_Bundle]):
+        """Write a batch, then settle each bundle and tell on_flush what landed"""
+        failures = await self._write(bundles)
+        written = []
+        for bundle in bundles:
+            error = failures.get(id(bundle))
+            if error is None:
+                written.append(bundle)
+            if not bundle.done.done():
+                bundle.done.set_result(error)
+
+        if written and self.on_flush is not None:
+            by_table: Dict[str, List[Dict]] = {}
+            for bundle in written:
+                for table, row in bundle.rows:
+                    by_table.setdefault(table, []).append(row)
+            await self.on_flush(by_table)
+
+    async def _write(self, bundles: List[_Bundle]) -> Dict[int, WriteFailed]:
+        """
+        Commit bundles together and return the ones that failed, by id().
+        If a row is rejected, retry bundle by bundle so one bad request can't sink the batch.
+        """
+        try:
+            await self._commit_retrying(bundles)
+            return {}
+        except _TRANSIENT_ERRORS as e:
+            logger.error("batch write of %d bundles failed after retries, dropping them: %s", len(bundles), e)
+            failure = WriteFailed("database unavailable", retryable=True)
+            return {id(bundle): failure for bundle in bundles}
+        except Exception as e:
+            if len(bundles) == 1:
+                logger.exception("batch write rejected, dropping rows %s", [
+                    (table, row.get("id")) for table, row in bundles[0].rows
+                ])
+                return {id(bundles[0]): WriteFailed(f"rows rejected: {e}", retryable=False)}
+
+        failures = {}
+        for bundle in bundles:
+            failures.update(await self._write([bundle]))
+        return failures
+
+    async def _commit_retrying(self, bundles: List[_Bundle]):
+        """Commit, backing off and retrying transient failures up to max_attempts (once after stop())"""
+        delay = self.retry_delay
+        attempt = 1
+        while True:
+            try:
+                await self._commit(bundles)
+                return
+            except _TRANSIENT_ERRORS:
+                if self._stopping or attempt >= self.max_attempts:
+                    raise
+                logger.warning("batch write of %d bundles failed, retrying in %.1fs", len(bundles), delay, exc_info=True)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                attempt += 1
+
+    async def _commit(self, bundles: List[_Bundle]):
+        """Insert every table's rows in FK order inside one transaction, one statement per column set"""
+        by_table: Dict[str, Dict[tuple, List[Dict]]] = {table: {} for table in self.tables}
+        for bundle in bundles:
+            for table, row in bundle.rows:
+                by_table[table].setdefault(tuple(row), []).append(row)
+
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                for table, groups in by_table.items():
+                    for columns, group in groups.items():
+                        column_list = ", ".join(columns)
+                        # jsonb_populate_recordset lets Postgres coerce every column type,
+                        # and omitted columns still get their table defaults
+                        await conn.execute(
+                            f"INSERT INTO {table} ({column_list}) "
+                            f"SELECT {column_list} FROM jsonb_populate_recordset(NULL::{table}, $1::text::jsonb)",
+                            json.dumps(group)
+                        )
@@ -3,55 +3,337 @@
 -- ARCHIVE WORKFORCE SCHEMA v1
 -- ============================================
 
+-- TYPES
+-- ============================================
+-- Closed value sets are enums: same labels on the wire, validated on write,
+-- and sorts/index lookups compare enum OIDs instead of collated text.
+-- Priority labels are declared in sort order, so ORDER BY priority is P0 first.
+-- Open-ended labels (owner_agent, source, insight_type, content_type) stay TEXT.
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'workforce_task_status') THEN
+        CREATE TYPE workforce_task_status AS ENUM
+            ('BACKLOG', 'IN_PROGRESS', 'NEEDS_REVIEW', 'DONE', 'BLOCKED', 'CANCELLED');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'workforce_task_priority') THEN
+        CREATE TYPE workforce_task_priority AS ENUM ('P0', 'P1', 'P2', 'P3');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'workforce_run_status') THEN
+        CREATE TYPE workforce_run_status AS ENUM ('running', 'success', 'failed', 'timeout');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'workforce_actor_type') THEN
+        CREATE TYPE workforce_actor_type AS ENUM ('agent', 'human', 'system');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'workforce_autonomy_mode') THEN
+        CREATE TYPE workforce_autonomy_mode AS ENUM ('advisory', 'review_only', 'full_autonomy');
+    END IF;
+END $$;
+
+-- Convert a column created by an older schema (e.g. TEXT) to its current type,
+-- keeping its default; a no-op once the column already has that type
+CREATE OR REPLACE FUNCTION workforce_retype_column(target TEXT, col TEXT, new_type TEXT)
+RETURNS VOID AS $$
+DECLARE
+    current_type TEXT;
+    col_default TEXT;
+BEGIN
+    SELECT format_type(a.atttypid, a.atttypmod), pg_get_expr(d.adbin, d.adrelid)
+    INTO current_type, col_default
+    FROM pg_attribute a
+    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE a.attrelid = target::regclass AND a.attname = col;
+    IF current_type = new_type THEN
+        RETURN;
+    END IF;
+    
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN %I DROP DEFAULT', target, col);
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN %I TYPE %s USING %I::text::%s', target, col, new_type, col, new_type);
+    IF col_default IS NOT NULL THEN
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET DEFAULT (%s)::text::%s', target, col, col_default, new_type);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- DROP/CREATE TRIGGER and CREATE INDEX lock their table (CREATE INDEX blocks
+-- writes) even when IF [NOT] EXISTS turns them into no-ops, so re-runs go
+-- through these and only issue the DDL when there is something to do. As
+-- with indexes, changing a trigger's definition means a new name.
+CREATE OR REPLACE FUNCTION workforce_create_trigger(target TEXT, trigger_name TEXT, definition TEXT)
+RETURNS VOID AS $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger WHERE tgrelid = to_regclass(target) AND tgname = trigger_name
+    ) THEN
+        EXECUTE definition;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION workforce_drop_trigger(target TEXT, trigger_name TEXT)
+RETURNS VOID AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_trigger WHERE tgrelid = to_regclass(target) AND tgname = trigger_name
+    ) THEN
+        EXECUTE format('DROP TRIGGER %I ON %I', trigger_name, target);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION workforce_create_index(index_name TEXT, definition TEXT)
+RETURNS VOID AS $$
+BEGIN
+    IF to_regclass(index_name) IS NULL THEN
+        EXECUTE definition;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Time-ordered UUID (RFC 9562 v7) for the id defaults: a 48-bit Unix ms
+-- timestamp over gen_random_uuid()'s random bits, so new rows land on the
+-- rightmost B-tree leaf instead of a random one. Same layout as _uuid7() in
+-- core/database.py. (PG18 ships uuidv7(); this works on older servers.)
+CREATE OR REPLACE FUNCTION workforce_uuid7()
+RETURNS UUID AS $$
+    SELECT encode(
+        -- Bits 52 and 53 turn the v4 version nibble (0100) into v7 (0111)
+        set_bit(set_bit(
+            overlay(uuid_send(gen_random_uuid())
+                placing substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::BIGINT) FROM 3)
+                FROM 1 FOR 6),
+            52, 1), 53, 1),
+        'hex')::UUID;
+$$ LANGUAGE sql VOLATILE;
+
+-- TIME PARTITIONING (insights, agent runs, audit log, events)
+-- ============================================
+-- The append-only logs are range-partitioned by month on their timestamp:
+-- time-bounded queries prune to one partition, each partition's indexes stay
+-- small, and retention is DROP TABLE instead of a mass DELETE. Partitions are
+-- named <table>_pYYYY_MM; <table>_default catches anything out of range.
+-- Insights are partitioned by week on expires_at (<table>_pYYYY_MM_DD, the
+-- Monday), so expiry drops a whole week at once.
+
+-- Move an unpartitioned table from an older schema out of the way (with its
+-- index names) so the partitioned parent can take its place
+CREATE OR REPLACE FUNCTION workforce_set_aside_unpartitioned(parent TEXT)
+RETURNS VOID AS $$
+DECLARE
+    legacy TEXT := parent || '_legacy';
+    con TEXT;
+    idx TEXT;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE relname = parent AND relkind = 'r' AND relnamespace = 'public'::regnamespace
+    ) THEN
+        RETURN;
+    END IF;
+    
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', parent, legacy);
+    FOR con IN SELECT conname FROM pg_constraint WHERE conrelid = legacy::regclass LOOP
+        EXECUTE format('ALTER TABLE %I RENAME CONSTRAINT %I TO %I', legacy, con, 'legacy_' || con);
+    END LOOP;
+    FOR idx IN
+        SELECT indexrelid::regclass::text FROM pg_index
+        WHERE indrelid = legacy::regclass AND NOT indisprimary
+    LOOP
+        EXECUTE 'DROP INDEX ' || idx;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Superseded by the (..., weekly) signature below
+DROP FUNCTION IF EXISTS workforce_ensure_partitions(TEXT, TEXT, INT);
+
+-- Create monthly partitions from the current month (or the oldest set-aside
+-- row) through months_ahead months from now, then copy any set-aside rows in
+CREATE OR REPLACE FUNCTION workforce_ensure_partitions(
+    parent TEXT,
+    ts_column TEXT,
+    months_ahead INT DEFAULT 3,
+    weekly BOOLEAN DEFAULT FALSE
+)
+RETURNS VOID AS $$
+DECLARE
+    legacy TEXT := parent || '_legacy';
+    unit TEXT := CASE WHEN weekly THEN 'week' ELSE 'month' END;
+    first_month TIMESTAMPTZ;
+    month TIMESTAMPTZ;
+    cols TEXT;
+    vals TEXT;
+    identity_cols TEXT[];
+BEGIN
+    IF to_regclass(legacy) IS NOT NULL THEN
+        EXECUTE format('SELECT min(%I) FROM %I', ts_column, legacy) INTO first_month;
+    END IF;
+    month := date_trunc(unit, least(coalesce(first_month, NOW()), NOW()), 'UTC');
+    
+    WHILE month <= date_trunc(unit, NOW(), 'UTC') + make_interval(months => months_ahead) LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent || '_p' || to_char(month AT TIME ZONE 'UTC', CASE WHEN weekly THEN 'YYYY_MM_DD' ELSE 'YYYY_MM' END),
+            parent, month, month + ('1 ' || unit)::INTERVAL
+        );
+        month := month + ('1 ' || unit)::INTERVAL;
+    END LOOP;
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT', parent || '_default', parent);
+    
+    IF to_regclass(legacy) IS NOT NULL THEN
+        -- Round-trip through jsonb so columns whose type changed (TEXT to enum)
+        -- convert too. Identity columns are left to the new table: the legacy
+        -- ids may be of another type (UUID audit ids before BIGINT).
+        SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) FILTER (WHERE attidentity = ''),
+               string_agg('r.' || quote_ident(attname), ', ' ORDER BY attnum) FILTER (WHERE attidentity = ''),
+               coalesce(array_agg(attname::text) FILTER (WHERE attidentity <> ''), '{}')
+        INTO cols, vals, identity_cols
+        FROM pg_attribute
+        WHERE attrelid = parent::regclass AND attnum > 0 AND NOT attisdropped;
+        EXECUTE format(
+            'INSERT INTO %I (%s) SELECT %s FROM %I l CROSS JOIN LATERAL jsonb_populate_record(NULL::%I, to_jsonb(l) - %L::text[]) r '
+            -- New identity ids follow the rows' time order, not heap order
+            'ORDER BY l.%I',
+            parent, cols, vals, legacy, parent, identity_cols, ts_column
+        );
+        -- CASCADE only reaches functions typed on the old table; they are recreated below
+        EXECUTE format('DROP TABLE %I CASCADE', legacy);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Drop whole monthly/weekly partitions that ended more than keep ago (retention)
+CREATE OR REPLACE FUNCTION workforce_drop_partitions(parent TEXT, keep INTERVAL)
+RETURNS VOID AS $$
+DECLARE
+    part TEXT;
+    ends TIMESTAMPTZ;
+BEGIN
+    FOR part IN
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = parent::regclass AND c.relname ~ '_p[0-9]{4}_[0-9]{2}(_[0-9]{2})?$'
+    LOOP
+        ends := CASE
+            WHEN part ~ '_p[0-9]{4}_[0-9]{2}_[0-9]{2}$' THEN to_date(right(part, 10), 'YYYY_MM_DD') + INTERVAL '1 week'
+            ELSE to_date(right(part, 7), 'YYYY_MM') + INTERVAL '1 month'
+        END AT TIME ZONE 'UTC';
+        IF ends <= NOW() - keep THEN
+            EXECUTE format('DROP TABLE %I', part);
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- CLUSTER each monthly partition whose month is over on the given index, once.
+-- Append-only partitions never receive new rows after that, so they stay
+-- clustered for good. The CLUSTER locks only the closed partition it rewrites.
+CREATE OR REPLACE FUNCTION workforce_cluster_closed_partitions(parent TEXT, index_name TEXT)
+RETURNS INT AS $$
+DECLARE
+    part TEXT;
+    part_index REGCLASS;
+    clustered INT := 0;
+BEGIN
+    FOR part IN
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = parent::regclass AND c.relname ~ '_p[0-9]{4}_[0-9]{2}$'
+        ORDER BY c.relname
+    LOOP
+        CONTINUE WHEN (to_date(right(part, 7), 'YYYY_MM') + INTERVAL '1 month') AT TIME ZONE 'UTC' > NOW();
+        
+        -- The partition's own copy of the parent index
+        SELECT x.indexrelid INTO part_index
+        FROM pg_inherits i JOIN pg_index x ON x.indexrelid = i.inhrelid
+        WHERE i.inhparent = index_name::regclass AND x.indrelid = part::regclass AND NOT x.indisclustered;
+        
+        IF part_index IS NOT NULL THEN
+            -- Also marks part_index as the partition's clustering index
+            EXECUTE format('CLUSTER %I USING %s', part, part_index);
+            clustered := clustered + 1;
+        END IF;
+    END LOOP;
+    RETURN clustered;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Keep next months' partitions in place and drop expired insight weeks;
+-- scheduled daily below when pg_cron is installed, and also run by the API
+-- on startup
+CREATE OR REPLACE FUNCTION workforce_maintain_partitions()
+RETURNS VOID AS $$
+BEGIN
+    PERFORM workforce_ensure_partitions('workforce_insights', 'expires_at', weekly => TRUE);
+    -- Expiry: a week goes once every insight in it has expired
+    PERFORM workforce_drop_partitions('workforce_insights', INTERVAL '0');
+    PERFORM workforce_ensure_partitions('workforce_agent_runs', 'started_at');
+    PERFORM workforce_ensure_partitions('workforce_audit_log', 'created_at');
+    PERFORM workforce_ensure_partitions('workforce_events', 'created_at');
+END;
+$$ LANGUAGE plpgsql;
+
 -- 1. TASKS TABLE (Core unit of intelligence)
 -- ============================================
+-- Columns in the log and task tables are declared widest fixed-width first
+-- (UUID, TIMESTAMPTZ, 4/2/1-byte) and variable-length last, so rows carry
+-- no alignment padding. New installs only; existing tables keep their layout.
 CREATE TABLE IF NOT EXISTS workforce_tasks (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    title TEXT NOT NULL,
-    description TEXT,
+    -- Identity & Hierarchy
+    id UUID PRIMARY KEY DEFAULT workforce_uuid7(),
+    parent_task_id UUID REFERENCES workforce_tasks(id),
     
-    -- Ownership & Assignment
-    owner_agent TEXT,  -- jarvis, chief_of_staff, ops_tracker, distribution, researcher
-    assigned_by TEXT,  -- Who/what created this task
+    -- Timestamps
+    due_at TIMESTAMPTZ,
+    approved_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
     
     -- Status & Priority
-    status TEXT NOT NULL DEFAULT 'BACKLOG',  -- BACKLOG, IN_PROGRESS, NEEDS_REVIEW, DONE, BLOCKED, CANCELLED
-    priority TEXT NOT NULL DEFAULT 'P2',  -- P0 (critical), P1 (high), P2 (medium), P3 (low)
-    
-    -- Metadata
-    tags TEXT[] DEFAULT '{}',  -- brand, domain, type tags
-    source TEXT NOT NULL DEFAULT 'api',  -- discord, telegram, api, ui
-    external_refs JSONB DEFAULT '{}',  -- Links to external systems
+    status workforce_task_status NOT NULL DEFAULT 'BACKLOG',  -- BACKLOG, IN_PROGRESS, NEEDS_REVIEW, DONE, BLOCKED, CANCELLED
+    priority workforce_task_priority NOT NULL DEFAULT 'P2',  -- P0 (critical), P1 (high), P2 (medium), P3 (low)
     
     -- Estimation
-    impact_score INTEGER,  -- 1-10
-    effort_estimate TEXT,  -- xs, s, m, l, xl
+    impact_score SMALLINT,  -- 1-10
     
     -- Approval
     requires_approval BOOLEAN DEFAULT FALSE,
     approved_by TEXT,
-    approved_at TIMESTAMPTZ,
     
-    -- Hierarchy
-    parent_task_id UUID REFERENCES workforce_tasks(id),
+    title TEXT NOT NULL,
+    description TEXT,
     
-    -- Timestamps
-    due_at TIMESTAMPTZ,
-    created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
-);
+    -- Ownership & Assignment
+    owner_agent TEXT,  -- jarvis, chief_of_staff, ops_tracker, distribution, researcher
+    assigned_by TEXT,  -- Who/what created this task
+    
+    -- Metadata
+    effort_estimate TEXT,  -- xs, s, m, l, xl
+    source TEXT NOT NULL DEFAULT 'api',  -- discord, telegram, api, ui
+    tags TEXT[] DEFAULT '{}',  -- brand, domain, type tags
+    external_refs JSONB DEFAULT '{}'  -- Links to external systems
+) WITH (fillfactor = 80);
 
--- Indexes for tasks
-CREATE INDEX IF NOT EXISTS idx_tasks_status ON workforce_tasks(status);
-CREATE INDEX IF NOT EXISTS idx_tasks_owner ON workforce_tasks(owner_agent);
-CREATE INDEX IF NOT EXISTS idx_tasks_priority ON workforce_tasks(priority);
-CREATE INDEX IF NOT EXISTS idx_tasks_parent ON workforce_tasks(parent_task_id);
-CREATE INDEX IF NOT EXISTS idx_tasks_created ON workforce_tasks(created_at DESC);
+-- Upgrade tables created when status/priority were TEXT. The old partial
+-- index's predicate compares against text, so drop it; idx_tasks_dispatch
+-- below replaces it.
+DO $$
+BEGIN
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'workforce_tasks' AND column_name = 'priority') = 'text' THEN
+        DROP INDEX IF EXISTS idx_tasks_agent_active;
+        ALTER TABLE workforce_tasks
+            ALTER COLUMN status DROP DEFAULT,
+            ALTER COLUMN priority DROP DEFAULT,
+            ALTER COLUMN status TYPE workforce_task_status USING status::workforce_task_status,
+            ALTER COLUMN priority TYPE workforce_task_priority USING priority::workforce_task_priority,
+            ALTER COLUMN status SET DEFAULT 'BACKLOG',
+            ALTER COLUMN priority SET DEFAULT 'P2';
+    END IF;
+    PERFORM workforce_retype_column('workforce_tasks', 'impact_score', 'smallint');
+END $$;
 
 -- 2. DELIVERABLES TABLE (Required for task completion)
 -- ============================================
 CREATE TABLE IF NOT EXISTS workforce_deliverables (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT workforce_uuid7(),
     task_id UUID NOT NULL REFERENCES workforce_tasks(id) ON DELETE CASCADE,
     
     title TEXT NOT NULL,
@@ -65,12 +347,21 @@ CREATE TABLE IF NOT EXISTS workforce_deliverables (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_deliverables_task ON workforce_deliverables(task_id);
-
 -- 3. INSIGHTS TABLE (Agent observations, not tasks)
 -- ============================================
+DO $$
+BEGIN
+    PERFORM workforce_set_aside_unpartitioned('workforce_insights');
+    -- expires_at is the partition key now, so it can no longer be NULL
+    IF to_regclass('workforce_insights_legacy') IS NOT NULL THEN
+        UPDATE workforce_insights_legacy
+        SET expires_at = coalesce(created_at, NOW()) + INTERVAL '7 days'
+        WHERE expires_at IS NULL;
+    END IF;
+END $$;
+
 CREATE TABLE IF NOT EXISTS workforce_insights (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT workforce_uuid7(),
     task_id UUID REFERENCES workforce_tasks(id) ON DELETE SET NULL,  -- Can be task-attached or floating
     
     agent TEXT NOT NULL,  -- Which agent posted this
@@ -81,15 +372,32 @@ CREATE TABLE IF NOT EXISTS workforce_insights (
     promoted_to_task_id UUID REFERENCES workforce_tasks(id),
     promoted_at TIMESTAMPTZ,
     
-    -- Auto-expiry
-    expires_at TIMESTAMPTZ DEFAULT (NOW() + INTERVAL '7 days'),
+    -- Auto-expiry (weekly partition key; expired weeks are dropped whole)
+    expires_at TIMESTAMPTZ NOT NULL DEFAULT (NOW() + INTERVAL '7 days'),
     
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    
+    PRIMARY KEY (id, expires_at)
+) PARTITION BY RANGE (expires_at);
 
-CREATE INDEX IF NOT EXISTS idx_insights_task ON workforce_insights(task_id);
-CREATE INDEX IF NOT EXISTS idx_insights_agent ON workforce_insights(agent);
-CREATE INDEX IF NOT EXISTS idx_insights_expires ON workforce_insights(expires_at);
+DO $$
+BEGIN
+    PERFORM workforce_create_index('idx_insights_task',
+        'CREATE INDEX idx_insights_task ON workforce_insights(task_id)');
+    PERFORM workforce_create_index('idx_insights_agent',
+        'CREATE INDEX idx_insights_agent ON workforce_insights(agent)');
+    -- Every FK onto workforce_tasks has an index on its referencing column, so a
+    -- task DELETE checks/nulls children by index lookup rather than a seq scan
+    PERFORM workforce_create_index('idx_insights_promoted',
+        'CREATE INDEX idx_insights_promoted ON workforce_insights(promoted_to_task_id)
+            WHERE promoted_to_task_id IS NOT NULL');
+    -- GET /insights pages on (created_at, id); partitions split on expires_at
+    -- can't prune by created_at, so each one needs this ordering indexed
+    PERFORM workforce_create_index('idx_insights_created_id',
+        'CREATE INDEX idx_insights_created_id ON workforce_insights(created_at DESC, id DESC)');
+END $$;
+
+DO $$ BEGIN PERFORM workforce_ensure_partitions('workforce_insights', 'expires_at', weekly => TRUE); END $$;
 
 -- 4. AGENT REGISTRY (Specialist definitions)
 -- ============================================
@@ -112,91 +420,205 @@ CREATE TABLE IF NOT EXISTS workforce_agents (
     -- State
     enabled BOOLEAN DEFAULT TRUE,
     last_run_at TIMESTAMPTZ,
-    last_run_status TEXT,
+    last_run_status workforce_run_status,
     
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
-);
+) WITH (fillfactor = 80);
+
+DO $$ BEGIN PERFORM workforce_retype_column('workforce_agents', 'last_run_status', 'workforce_run_status'); END $$;
 
 -- 5. AGENT RUNS (Execution log)
 -- ============================================
+DO $$ BEGIN PERFORM workforce_set_aside_unpartitioned('workforce_agent_runs'); END $$;
+
 CREATE TABLE IF NOT EXISTS workforce_agent_runs (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    agent_id TEXT NOT NULL REFERENCES workforce_agents(id),
+    id UUID NOT NULL DEFAULT workforce_uuid7(),
     
-    status TEXT NOT NULL DEFAULT 'running',  -- running, success, failed, timeout
+    -- Timing (started_at is the partition key)
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    completed_at TIMESTAMPTZ,
+    duration_ms INTEGER,
+    
+    status workforce_run_status NOT NULL DEFAULT 'running',  -- running, success, failed, timeout
     tasks_processed INTEGER DEFAULT 0,
     insights_created INTEGER DEFAULT 0,
     
-    -- Timing
-    started_at TIMESTAMPTZ DEFAULT NOW(),
-    completed_at TIMESTAMPTZ,
-    duration_ms INTEGER,
+    -- Token usage
+    tokens_used INTEGER DEFAULT 0,
+    
+    agent_id TEXT NOT NULL REFERENCES workforce_agents(id),
     
     -- Error tracking
     error_message TEXT,
     
-    -- Token usage
-    tokens_used INTEGER DEFAULT 0
-);
+    PRIMARY KEY (id, started_at)
+) PARTITION BY RANGE (started_at);
+
+-- Runs are only ever range-filtered by started_at, never read in order, and
+-- started_at follows insertion order, so a BRIN summary is enough. Replace
+-- the BTREE that older installs created under the same name.
+DO $$
+BEGIN
+    PERFORM workforce_create_index('idx_runs_agent',
+        'CREATE INDEX idx_runs_agent ON workforce_agent_runs(agent_id)');
+    IF EXISTS (
+        SELECT 1 FROM pg_class i JOIN pg_am am ON am.oid = i.relam
+        WHERE i.relname = 'idx_runs_started' AND am.amname <> 'brin'
+    ) THEN
+        DROP INDEX idx_runs_started;
+    END IF;
+    PERFORM workforce_create_index('idx_runs_started',
+        'CREATE INDEX idx_runs_started ON workforce_agent_runs
+            USING BRIN (started_at) WITH (pages_per_range = 32)');
+END $$;
 
-CREATE INDEX IF NOT EXISTS idx_runs_agent ON workforce_agent_runs(agent_id);
-CREATE INDEX IF NOT EXISTS idx_runs_started ON workforce_agent_runs(started_at DESC);
+DO $$
+BEGIN
+    -- The UPDATE OF status trigger pins the column type; it is recreated below
+    IF (SELECT atttypid FROM pg_attribute
+        WHERE attrelid = 'workforce_agent_runs'::regclass AND attname = 'status') <> 'workforce_run_status'::regtype THEN
+        PERFORM workforce_drop_trigger('workforce_agent_runs', 'agent_runs_last_run');
+    END IF;
+    PERFORM workforce_retype_column('workforce_agent_runs', 'status', 'workforce_run_status');
+    PERFORM workforce_ensure_partitions('workforce_agent_runs', 'started_at');
+END $$;
 
 -- 6. AUDIT LOG (Append-only, forever)
 -- ============================================
+DO $$ BEGIN PERFORM workforce_set_aside_unpartitioned('workforce_audit_log'); END $$;
+
+-- Audit rows are never referenced by id from outside, so the key is an
+-- 8-byte identity rather than a UUID. Installs partitioned while it was a
+-- UUID keep it: the id is hashed into the chain, so it can't be rewritten.
+-- ALWAYS: nothing supplies audit ids, so an explicit one is a mistake.
 CREATE TABLE IF NOT EXISTS workforce_audit_log (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id BIGINT GENERATED ALWAYS AS IDENTITY,
+    
+    -- Timestamp (immutable, partition key)
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    
+    -- Tamper-evidence hash chain (set by the audit_log_chain trigger)
+    chain_seq BIGINT,
+    
+    -- Who did it
+    actor_type workforce_actor_type NOT NULL,  -- agent, human, system
+    actor TEXT NOT NULL,  -- Agent ID or human ID
     
     -- What happened
     event_type TEXT NOT NULL,  -- TASK_CREATED, STATUS_CHANGED, etc.
     entity_type TEXT NOT NULL,  -- task, insight, deliverable, agent
     entity_id TEXT NOT NULL,
     
-    -- Who did it
-    actor TEXT NOT NULL,  -- Agent ID or human ID
-    actor_type TEXT NOT NULL,  -- agent, human, system
-    
     -- Change details
     old_value JSONB,
     new_value JSONB,
     metadata JSONB DEFAULT '{}',
     
-    -- Timestamp (immutable)
-    created_at TIMESTAMPTZ DEFAULT NOW()
+    prev_hash BYTEA,
+    curr_hash BYTEA,
+    
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+DO $$
+BEGIN
+    IF (SELECT count(*) FROM pg_attribute
+        WHERE attrelid = 'workforce_audit_log'::regclass AND NOT attisdropped
+          AND attname IN ('chain_seq', 'prev_hash', 'curr_hash')) < 3 THEN
+        ALTER TABLE workforce_audit_log
+            ADD COLUMN IF NOT EXISTS chain_seq BIGINT,
+            ADD COLUMN IF NOT EXISTS prev_hash BYTEA,
+            ADD COLUMN IF NOT EXISTS curr_hash BYTEA;
+    END IF;
+    -- Installs created while the identity was BY DEFAULT
+    IF (SELECT attidentity FROM pg_attribute
+        WHERE attrelid = 'workforce_audit_log'::regclass AND attname = 'id') = 'd' THEN
+        ALTER TABLE workforce_audit_log ALTER COLUMN id SET GENERATED ALWAYS;
+    END IF;
+END $$;
+
+-- Head of the hash chain; its row lock serializes chained inserts
+CREATE TABLE IF NOT EXISTS workforce_audit_chain (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    last_seq BIGINT NOT NULL DEFAULT 0,
+    last_hash BYTEA
 );
+INSERT INTO workforce_audit_chain (id) VALUES (TRUE) ON CONFLICT (id) DO NOTHING;
 
 -- Audit log should NEVER be updated or deleted
-CREATE INDEX IF NOT EXISTS idx_audit_entity ON workforce_audit_log(entity_type, entity_id);
-CREATE INDEX IF NOT EXISTS idx_audit_event ON workforce_audit_log(event_type);
-CREATE INDEX IF NOT EXISTS idx_audit_actor ON workforce_audit_log(actor);
-CREATE INDEX IF NOT EXISTS idx_audit_created ON workforce_audit_log(created_at DESC);
+DO $$
+BEGIN
+    PERFORM workforce_create_index('idx_audit_entity',
+        'CREATE INDEX idx_audit_entity ON workforce_audit_log(entity_type, entity_id)');
+    PERFORM workforce_create_index('idx_audit_event',
+        'CREATE INDEX idx_audit_event ON workforce_audit_log(event_type)');
+    PERFORM workforce_create_index('idx_audit_actor',
+        'CREATE INDEX idx_audit_actor ON workforce_audit_log(actor)');
+    -- Stays BTREE: GET /audit returns the newest rows (ORDER BY created_at DESC, id DESC LIMIT n);
+    -- id breaks created_at ties so the (created_at, id) cursor never skips rows
+    DROP INDEX IF EXISTS idx_audit_created;
+    PERFORM workforce_create_index('idx_audit_created_id',
+        'CREATE INDEX idx_audit_created_id ON workforce_audit_log(created_at DESC, id DESC)');
+END $$;
+
+DO $$
+BEGIN
+    PERFORM workforce_retype_column('workforce_audit_log', 'actor_type', 'workforce_actor_type');
+    PERFORM workforce_ensure_partitions('workforce_audit_log', 'created_at');
+END $$;
 
 -- 7. EVENT LOG (For event-driven triggers)
 -- ============================================
+DO $$ BEGIN PERFORM workforce_set_aside_unpartitioned('workforce_events'); END $$;
+
 CREATE TABLE IF NOT EXISTS workforce_events (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    
-    event_type TEXT NOT NULL,
-    payload JSONB NOT NULL,
+    id UUID NOT NULL DEFAULT workforce_uuid7(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),  -- partition key
     
     -- Processing state
-    processed BOOLEAN DEFAULT FALSE,
     processed_at TIMESTAMPTZ,
+    processed BOOLEAN DEFAULT FALSE,
     processed_by TEXT,
     
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    event_type TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+DO $$
+BEGIN
+    PERFORM workforce_create_index('idx_events_type',
+        'CREATE INDEX idx_events_type ON workforce_events(event_type)');
+    -- The dispatcher only reads the live queue; processed rows stay out of this index
+    DROP INDEX IF EXISTS idx_events_processed;
+    DROP INDEX IF EXISTS idx_events_unprocessed;
+    PERFORM workforce_create_index('idx_events_unprocessed_id',
+        'CREATE INDEX idx_events_unprocessed_id ON workforce_events(created_at, id) WHERE processed = FALSE');
+END $$;
+
+DO $$ BEGIN PERFORM workforce_ensure_partitions('workforce_events', 'created_at'); END $$;
 
-CREATE INDEX IF NOT EXISTS idx_events_type ON workforce_events(event_type);
-CREATE INDEX IF NOT EXISTS idx_events_processed ON workforce_events(processed, created_at);
+-- Pre-create partitions daily, and cluster last month's audit partition by
+-- entity (so an entity's history is a few adjacent pages), where pg_cron is available
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule('workforce-partitions', '0 3 * * *', 'SELECT workforce_maintain_partitions()');
+        PERFORM cron.schedule(
+            'workforce-audit-cluster', '30 3 2 * *',
+            $cron$SELECT workforce_cluster_closed_partitions('workforce_audit_log', 'idx_audit_entity')$cron$
+        );
+    END IF;
+END $$;
 
 -- 8. AUTONOMY SESSIONS (Time-boxed autonomy grants)
 -- ============================================
 CREATE TABLE IF NOT EXISTS workforce_autonomy_sessions (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT workforce_uuid7(),
     
-    mode TEXT NOT NULL,  -- advisory, review_only, full_autonomy
+    mode workforce_autonomy_mode NOT NULL,  -- advisory, review_only, full_autonomy
     granted_by TEXT NOT NULL,  -- Human who granted it
     granted_to TEXT,  -- Specific agent or NULL for all
     
@@ -213,63 +635,537 @@ CREATE TABLE IF NOT EXISTS workforce_autonomy_sessions (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_autonomy_active ON workforce_autonomy_sessions(expires_at) 
-    WHERE revoked_at IS NULL;
+DO $$ BEGIN PERFORM workforce_retype_column('workforce_autonomy_sessions', 'mode', 'workforce_autonomy_mode'); END $$;
+
+-- ============================================
+-- JSONB COMPRESSION
+-- ============================================
+-- TOAST the JSONB-heavy columns with LZ4 (much faster than the pglz default
+-- to compress and decompress) when the server was built with it. Only the
+-- column setting changes: values already stored stay pglz until rewritten.
+DO $$
+DECLARE
+    col RECORD;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_settings WHERE name = 'default_toast_compression' AND 'lz4' = ANY (enumvals)) THEN
+        -- SET COMPRESSION doesn't recurse, so visit existing partitions too;
+        -- partitions created later inherit the parent's setting
+        FOR col IN
+            SELECT t.relid, c.name
+            FROM (VALUES
+                ('workforce_tasks', 'external_refs'),
+                ('workforce_events', 'payload'),
+                ('workforce_audit_log', 'old_value'),
+                ('workforce_audit_log', 'new_value'),
+                ('workforce_audit_log', 'metadata')
+            ) AS c(target, name)
+            CROSS JOIN LATERAL pg_partition_tree(c.target::regclass) t
+            JOIN pg_attribute a ON a.attrelid = t.relid AND a.attname = c.name
+            -- Skip columns already done so re-runs take no table locks
+            WHERE a.attcompression IS DISTINCT FROM 'l'
+        LOOP
+            EXECUTE format('ALTER TABLE %s ALTER COLUMN %I SET COMPRESSION lz4', col.relid, col.name);
+        END LOOP;
+    END IF;
+END $$;
+
+-- Tasks and agents are updated in place, so leave 20% of each page free for
+-- the new row version (a HOT update when no indexed column changed, e.g. an
+-- agent's last_run_*). Append-only tables keep the default of 100.
+-- Applies to pages written from now on; tables created earlier get it here.
+DO $$
+DECLARE
+    target TEXT;
+BEGIN
+    FOREACH target IN ARRAY ARRAY['workforce_tasks', 'workforce_agents'] LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_class WHERE oid = target::regclass AND 'fillfactor=80' = ANY (reloptions)
+        ) THEN
+            EXECUTE format('ALTER TABLE %I SET (fillfactor = 80)', target);
+        END IF;
+    END LOOP;
+END $$;
+
+-- Tables created before workforce_uuid7() keep gen_random_uuid() as their id
+-- default; switch them (only where needed, so re-runs take no locks)
+DO $$
+DECLARE
+    target TEXT;
+BEGIN
+    FOR target IN
+        SELECT c.relname FROM pg_attrdef d
+        JOIN pg_class c ON c.oid = d.adrelid
+        JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum
+        WHERE c.relname LIKE 'workforce\_%' AND c.relispartition IS FALSE
+          AND a.attname = 'id' AND pg_get_expr(d.adbin, d.adrelid) = 'gen_random_uuid()'
+    LOOP
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN id SET DEFAULT workforce_uuid7()', target);
+    END LOOP;
+END $$;
 
 -- ============================================
 -- FUNCTIONS & TRIGGERS
 -- ============================================
 
--- Auto-update updated_at on tasks
-CREATE OR REPLACE FUNCTION update_updated_at()
+-- updated_at is set by the writer in the UPDATE itself (WorkforceDB stamps
+-- every task/agent update), so no per-row trigger runs on bulk updates
+DO $$
+BEGIN
+    PERFORM workforce_drop_trigger('workforce_tasks', 'tasks_updated_at');
+    PERFORM workforce_drop_trigger('workforce_agents', 'agents_updated_at');
+END $$;
+DROP FUNCTION IF EXISTS update_updated_at();
+
+-- Keep workforce_agents.last_run_* in step with the run log (saves a second write per run)
+CREATE OR REPLACE FUNCTION record_agent_last_run()
 RETURNS TRIGGER AS $$
 BEGIN
-    NEW.updated_at = NOW();
+    UPDATE workforce_agents
+    SET last_run_at = NEW.started_at,
+        last_run_status = NEW.status,
+        updated_at = NOW()
+    WHERE id = NEW.agent_id;
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
-DROP TRIGGER IF EXISTS tasks_updated_at ON workforce_tasks;
-CREATE TRIGGER tasks_updated_at
-    BEFORE UPDATE ON workforce_tasks
-    FOR EACH ROW
-    EXECUTE FUNCTION update_updated_at();
+DO $$
+BEGIN
+    PERFORM workforce_create_trigger('workforce_agent_runs', 'agent_runs_last_run', $ddl$
+        CREATE TRIGGER agent_runs_last_run
+            AFTER INSERT OR UPDATE OF status ON workforce_agent_runs
+            FOR EACH ROW
+            EXECUTE FUNCTION record_agent_last_run()
+    $ddl$);
+END $$;
+
+-- Audit log hash chain: each row's curr_hash covers its content and the
+-- previous row's hash, so verification is one ordered pass over chain_seq
+-- and any edited, removed or reordered row breaks every hash after it.
+-- created_at goes in as epoch seconds: timestamp text follows the session's
+-- DateStyle, so a row chained under one setting would fail under another.
+CREATE OR REPLACE FUNCTION workforce_audit_hash(prev BYTEA, r workforce_audit_log)
+RETURNS BYTEA AS $$
+    SELECT sha256(coalesce(prev, 'GENESIS'::bytea) || convert_to(concat_ws('|',
+        r.chain_seq, r.id, r.event_type, r.entity_type, r.entity_id, r.actor, r.actor_type,
+        r.old_value::text, r.new_value::text, r.metadata::text, extract(epoch FROM r.created_at)::text
+    ), 'UTF8'));
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION chain_audit_row()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE workforce_audit_chain SET last_seq = last_seq + 1
+    RETURNING last_seq, last_hash INTO NEW.chain_seq, NEW.prev_hash;
+    NEW.curr_hash := workforce_audit_hash(NEW.prev_hash, NEW);
+    UPDATE workforce_audit_chain SET last_hash = NEW.curr_hash;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    PERFORM workforce_create_trigger('workforce_audit_log', 'audit_log_chain', $ddl$
+        CREATE TRIGGER audit_log_chain
+            BEFORE INSERT ON workforce_audit_log
+            FOR EACH ROW
+            EXECUTE FUNCTION chain_audit_row()
+    $ddl$);
+END $$;
+
+-- Append-only: no role gets to rewrite history (retention drops whole partitions)
+CREATE OR REPLACE FUNCTION reject_audit_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'workforce_audit_log is append-only' USING ERRCODE = 'insufficient_privilege';
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    PERFORM workforce_create_trigger('workforce_audit_log', 'audit_log_append_only', $ddl$
+        CREATE TRIGGER audit_log_append_only
+            BEFORE UPDATE OR DELETE ON workforce_audit_log
+            FOR EACH ROW
+            EXECUTE FUNCTION reject_audit_change()
+    $ddl$);
+END $$;
 
-DROP TRIGGER IF EXISTS agents_updated_at ON workforce_agents;
-CREATE TRIGGER agents_updated_at
-    BEFORE UPDATE ON workforce_agents
-    FOR EACH ROW
-    EXECUTE FUNCTION update_updated_at();
+REVOKE UPDATE, DELETE, TRUNCATE ON workforce_audit_log FROM PUBLIC;
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+        REVOKE UPDATE, DELETE, TRUNCATE ON workforce_audit_log FROM anon, authenticated;
+    END IF;
+END $$;
+
+-- Walk the chain in order; first_bad_seq is NULL when every hash checks out
+CREATE OR REPLACE FUNCTION workforce_verify_audit_chain()
+RETURNS TABLE(checked BIGINT, first_bad_seq BIGINT) AS $$
+DECLARE
+    r workforce_audit_log;
+    prev BYTEA;
+    expected_seq BIGINT;
+BEGIN
+    checked := 0;
+    FOR r IN SELECT * FROM workforce_audit_log WHERE chain_seq IS NOT NULL ORDER BY chain_seq LOOP
+        IF expected_seq IS NOT NULL AND (
+            r.chain_seq <> expected_seq OR r.prev_hash IS DISTINCT FROM prev
+        ) OR r.curr_hash IS DISTINCT FROM workforce_audit_hash(r.prev_hash, r) THEN
+            first_bad_seq := r.chain_seq;
+            RETURN NEXT;
+            RETURN;
+        END IF;
+        checked := checked + 1;
+        prev := r.curr_hash;
+        expected_seq := r.chain_seq + 1;
+    END LOOP;
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Push notifications so consumers can LISTEN instead of polling. NOTIFY is
+-- delivered on commit, so listeners never see rolled-back rows; the payload
+-- is a small hint and consumers re-read the row.
+CREATE OR REPLACE FUNCTION notify_workforce_event()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('workforce_events', json_build_object('id', NEW.id, 'type', NEW.event_type)::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    PERFORM workforce_create_trigger('workforce_events', 'workforce_events_notify', $ddl$
+        CREATE CONSTRAINT TRIGGER workforce_events_notify
+            AFTER INSERT ON workforce_events
+            DEFERRABLE
+            FOR EACH ROW
+            EXECUTE FUNCTION notify_workforce_event()
+    $ddl$);
+END $$;
+
+CREATE OR REPLACE FUNCTION notify_workforce_task_status()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.status IS NOT DISTINCT FROM NEW.status THEN
+        RETURN NEW;
+    END IF;
+    PERFORM pg_notify('workforce_tasks_changed', json_build_object(
+        'id', NEW.id, 'owner_agent', NEW.owner_agent, 'status', NEW.status
+    )::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    PERFORM workforce_create_trigger('workforce_tasks', 'tasks_status_notify', $ddl$
+        CREATE TRIGGER tasks_status_notify
+            AFTER INSERT OR UPDATE OF status ON workforce_tasks
+            FOR EACH ROW
+            EXECUTE FUNCTION notify_workforce_task_status()
+    $ddl$);
+END $$;
+
+-- Transactional writes (called via RPC so a mutation and its audit/event
+-- rows land in one round-trip and one transaction)
+-- Rows are grouped by key set so omitted columns keep their table defaults
+CREATE OR REPLACE FUNCTION workforce_insert_rows(target TEXT, rows JSONB)
+RETURNS SETOF JSONB AS $$
+DECLARE
+    cols TEXT;
+    grp JSONB;
+BEGIN
+    IF target !~ '^workforce_[a-z_]+$' THEN
+        RAISE EXCEPTION 'Not a workforce table: %', target;
+    END IF;
+    IF jsonb_typeof(rows) = 'object' THEN
+        rows := jsonb_build_array(rows);
+    END IF;
+    
+    FOR cols, grp IN
+        SELECT keys, jsonb_agg(r)
+        FROM (
+            SELECT r, (SELECT string_agg(quote_ident(k), ', ' ORDER BY k) FROM jsonb_object_keys(r) k) AS keys
+            FROM jsonb_array_elements(rows) r
+        ) x
+        WHERE keys IS NOT NULL
+        GROUP BY keys
+    LOOP
+        RETURN QUERY EXECUTE format(
+            'INSERT INTO %1$I (%2$s) SELECT %2$s FROM jsonb_populate_recordset(NULL::%1$I, $1) RETURNING to_jsonb(%1$I.*)',
+            target, cols
+        ) USING grp;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION workforce_insert_with_audit(
+    target TEXT,
+    record JSONB,
+    audit JSONB DEFAULT NULL,
+    event JSONB DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+    inserted JSONB;
+BEGIN
+    SELECT r INTO inserted FROM workforce_insert_rows(target, record) r;
+    IF audit IS NOT NULL THEN
+        PERFORM workforce_insert_rows('workforce_audit_log', audit);
+    END IF;
+    IF event IS NOT NULL THEN
+        PERFORM workforce_insert_rows('workforce_events', event);
+    END IF;
+    RETURN inserted;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION workforce_insert_many_with_audit(
+    target TEXT,
+    records JSONB,
+    audit JSONB DEFAULT NULL,
+    event JSONB DEFAULT NULL
+)
+RETURNS SETOF JSONB AS $$
+BEGIN
+    RETURN QUERY SELECT r FROM workforce_insert_rows(target, records) r;
+    IF audit IS NOT NULL THEN
+        PERFORM workforce_insert_rows('workforce_audit_log', audit);
+    END IF;
+    IF event IS NOT NULL THEN
+        PERFORM workforce_insert_rows('workforce_events', event);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION workforce_update_with_audit(
+    target TEXT,
+    record_id TEXT,
+    changes JSONB,
+    audit JSONB DEFAULT NULL,
+    event JSONB DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+    cols TEXT;
+    vals TEXT;
+    updated JSONB;
+BEGIN
+    IF target !~ '^workforce_[a-z_]+$' THEN
+        RAISE EXCEPTION 'Not a workforce table: %', target;
+    END IF;
+    
+    SELECT string_agg(quote_ident(k), ', '), string_agg('r.' || quote_ident(k), ', ') INTO cols, vals
+    FROM jsonb_object_keys(changes - 'id') k;
+    IF cols IS NULL THEN
+        RAISE EXCEPTION 'No columns to update';
+    END IF;
+    
+    -- The id goes through the same record so it is cast to the table's key type
+    EXECUTE format(
+        'UPDATE %1$I t SET (%2$s) = ROW(%3$s) FROM jsonb_populate_record(NULL::%1$I, $1) r WHERE t.id = r.id RETURNING to_jsonb(t.*)',
+        target, cols, vals
+    ) INTO updated USING changes || jsonb_build_object('id', record_id);
+    
+    IF updated IS NOT NULL THEN
+        IF audit IS NOT NULL THEN
+            PERFORM workforce_insert_rows('workforce_audit_log', audit);
+        END IF;
+        IF event IS NOT NULL THEN
+            PERFORM workforce_insert_rows('workforce_events', event);
+        END IF;
+    END IF;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Checked task update: locks the row, enforces the DONE rules, applies the
+-- change and writes the audit row (+ status event) atomically
+CREATE OR REPLACE FUNCTION update_task_checked(
+    target_id UUID,
+    changes JSONB,
+    changed_by TEXT,
+    changed_by_type TEXT,
+    extra_audit JSONB DEFAULT '[]'
+)
+RETURNS TABLE(old JSONB, new JSONB) AS $$
+DECLARE
+    current workforce_tasks;
+    new_status TEXT := changes->>'status';
+    audit JSONB;
+    event JSONB;
+BEGIN
+    SELECT * INTO current FROM workforce_tasks WHERE id = target_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Task % not found', target_id USING ERRCODE = 'no_data_found';
+    END IF;
+    
+    -- Enforce deliverable and approval requirements for DONE
+    IF new_status = 'DONE' AND current.status IS DISTINCT FROM 'DONE' THEN
+        IF NOT EXISTS (SELECT 1 FROM workforce_deliverables WHERE task_id = target_id) THEN
+            RAISE EXCEPTION 'Cannot mark task DONE without at least one deliverable' USING ERRCODE = 'check_violation';
+        END IF;
+        IF current.requires_approval AND current.approved_by IS NULL THEN
+            RAISE EXCEPTION 'Task requires approval before marking DONE' USING ERRCODE = 'check_violation';
+        END IF;
+    END IF;
+    
+    old := to_jsonb(current);
+    audit := jsonb_build_array(jsonb_build_object(
+        'event_type', 'TASK_UPDATED',
+        'entity_type', 'task',
+        'entity_id', target_id::text,
+        'actor', changed_by,
+        'actor_type', changed_by_type,
+        'old_value', (SELECT jsonb_object_agg(k, old->k) FROM jsonb_object_keys(changes) k),
+        'new_value', changes
+    )) || extra_audit;
+    IF new_status IS NOT NULL AND new_status IS DISTINCT FROM current.status::text THEN
+        event := jsonb_build_object(
+            'event_type', 'STATUS_CHANGED',
+            'payload', jsonb_build_object('task_id', target_id, 'old_status', current.status, 'new_status', new_status)
+        );
+    END IF;
+    
+    new := workforce_update_with_audit('workforce_tasks', target_id::text, changes, audit, event);
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Promote an insight to a task in one transaction. The title and description
+-- come from the insight's content here, so it never travels to the client.
+CREATE OR REPLACE FUNCTION promote_insight_to_task(
+    insight_id UUID,
+    task JSONB,
+    audit JSONB,
+    event JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    insight_content TEXT;
+    promoted_task UUID;
+    created JSONB;
+BEGIN
+    SELECT content, promoted_to_task_id INTO insight_content, promoted_task
+    FROM workforce_insights WHERE id = insight_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Insight % not found', insight_id USING ERRCODE = 'no_data_found';
+    END IF;
+    -- Already promoted (a retry, or a second call that queued on the row
+    -- lock above): hand back that task rather than creating another
+    IF promoted_task IS NOT NULL THEN
+        RETURN (SELECT to_jsonb(t) FROM workforce_tasks t WHERE t.id = promoted_task);
+    END IF;
+    
+    task := task || jsonb_build_object(
+        'title', '[From Insight] ' || left(insight_content, 100),
+        'description', insight_content
+    );
+    audit := jsonb_set(audit, '{new_value}', task);
+    created := workforce_insert_with_audit('workforce_tasks', task, audit, event);
+    
+    UPDATE workforce_insights
+    SET promoted_to_task_id = (created->>'id')::uuid, promoted_at = (task->>'created_at')::timestamptz
+    WHERE id = insight_id;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Claim a batch of unprocessed events for one consumer. SKIP LOCKED lets
+-- several dispatchers drain the queue without handing out the same event twice.
+CREATE OR REPLACE FUNCTION claim_unprocessed_events(
+    claimed_by TEXT,
+    batch_size INT DEFAULT 100
+)
+RETURNS SETOF workforce_events AS $$
+    UPDATE workforce_events e
+    SET processed = TRUE, processed_at = NOW(), processed_by = claimed_by
+    FROM (
+        SELECT id FROM workforce_events
+        WHERE processed = FALSE
+        ORDER BY created_at
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    ) claimed
+    WHERE e.id = claimed.id
+    RETURNING e.*;
+$$ LANGUAGE sql;
+
+-- ============================================
+-- INDEXES (non-partitioned tables)
+-- ============================================
+-- Kept together so the migration runner can build (and drop) them
+-- CONCURRENTLY, one statement per transaction, without blocking writes.
+-- Partitioned tables (insights, runs, audit, events) can't build
+-- concurrently; their indexes stay with the table definitions above.
+
+-- Tasks
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON workforce_tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_parent ON workforce_tasks(parent_task_id);
+-- Stays BTREE: GET /tasks pages with ORDER BY created_at DESC, id DESC LIMIT n
+DROP INDEX IF EXISTS idx_tasks_created;
+CREATE INDEX IF NOT EXISTS idx_tasks_created_id ON workforce_tasks(created_at DESC, id DESC);
+-- Agent run queue: owner_agent = ? AND status NOT IN (DONE, CANCELLED) ORDER BY priority, updated_at DESC.
+-- INCLUDE carries DISPATCH_TASK_COLUMNS so that read is an index-only scan.
+CREATE INDEX IF NOT EXISTS idx_tasks_dispatch ON workforce_tasks(owner_agent, priority, updated_at DESC)
+    INCLUDE (id, title, impact_score)
+    WHERE status NOT IN ('DONE', 'CANCELLED');
+-- Superseded by idx_tasks_dispatch (owner_agent and priority alone are too
+-- coarse to be worth their write cost)
+DROP INDEX IF EXISTS idx_tasks_agent_active;
+DROP INDEX IF EXISTS idx_tasks_owner;
+DROP INDEX IF EXISTS idx_tasks_priority;
+-- Tag filters: tags @> ARRAY[...] (GET /tasks?tag=); = ANY(tags) can't use it
+CREATE INDEX IF NOT EXISTS idx_tasks_tags ON workforce_tasks USING GIN (tags);
+
+-- Deliverables
+CREATE INDEX IF NOT EXISTS idx_deliverables_task ON workforce_deliverables(task_id);
+
+-- Autonomy sessions
+CREATE INDEX IF NOT EXISTS idx_autonomy_active ON workforce_autonomy_sessions(expires_at)
+    WHERE revoked_at IS NULL;
 
 -- ============================================
 -- SEED DATA: Initial Agents
 -- ============================================
+-- One row set from a single JSON document (the same jsonb_populate_recordset
+-- form the batch writer uses), so the registry is one plan however it grows
 INSERT INTO workforce_agents (id, name, role, description, capabilities, allowed_actions, model_provider, model_id, schedule_interval_minutes)
-VALUES 
-    ('jarvis', 'Jarvis', 'Router/Brain', 'Intake, task creation, assignment, prioritization. NEVER executes work.', 
-     ARRAY['intake', 'route', 'prioritize', 'summarize'], 
-     ARRAY['create_task', 'assign_task', 'update_priority', 'summarize_status'],
-     'openai', 'gpt-4o', 60),
-    
-    ('chief_of_staff', 'Chief of Staff', 'Meta-Observer', 'Reports workflow status, agent health, problem escalation.',
-     ARRAY['observe', 'report', 'escalate'],
-     ARRAY['add_insight', 'create_report', 'flag_problem'],
-     'openai', 'gpt-4o-mini', 30),
-    
-    ('ops_tracker', 'Ops Tracker', 'Pakistan Ops Spine', 'Discord bot integration, daily ops reports, creator tracking.',
-     ARRAY['track', 'report', 'monitor'],
-     ARRAY['add_insight', 'create_report', 'query_tracking_data'],
-     'openai', 'gpt-4o-mini', 60),
-    
-    ('distribution', 'Distribution Specialist', 'Scale Engine', 'Phone farm automation, distribution sauce, scaling operations.',
-     ARRAY['automate', 'scale', 'distribute'],
-     ARRAY['add_insight', 'trigger_automation', 'report_distribution'],
-     'openai', 'gpt-4o-mini', 90),
-    
-    ('researcher', 'Content Researcher', 'Research', 'Content research, trend analysis, competitor monitoring.',
-     ARRAY['research', 'analyze', 'monitor'],
-     ARRAY['add_insight', 'create_report'],
-     'openai', 'gpt-4o-mini', 120)
+SELECT id, name, role, description, capabilities, allowed_actions, model_provider, model_id, schedule_interval_minutes
+FROM jsonb_populate_recordset(NULL::workforce_agents, '[
+    {"id": "jarvis", "name": "Jarvis", "role": "Router/Brain",
+     "description": "Intake, task creation, assignment, prioritization. NEVER executes work.",
+     "capabilities": ["intake", "route", "prioritize", "summarize"],
+     "allowed_actions": ["create_task", "assign_task", "update_priority", "summarize_status"],
+     "model_provider": "openai", "model_id": "gpt-4o", "schedule_interval_minutes": 60},
+    
+    {"id": "chief_of_staff", "name": "Chief of Staff", "role": "Meta-Observer",
+     "description": "Reports workflow status, agent health, problem escalation.",
+     "capabilities": ["observe", "report", "escalate"],
+     "allowed_actions": ["add_insight", "create_report", "flag_problem"],
+     "model_provider": "openai", "model_id": "gpt-4o-mini", "schedule_interval_minutes": 30},
+    
+    {"id": "ops_tracker", "name": "Ops Tracker", "role": "Pakistan Ops Spine",
+     "description": "Discord bot integration, daily ops reports, creator tracking.",
+     "capabilities": ["track", "report", "monitor"],
+     "allowed_actions": ["add_insight", "create_report", "query_tracking_data"],
+     "model_provider": "openai", "model_id": "gpt-4o-mini", "schedule_interval_minutes": 60},
+    
+    {"id": "distribution", "name": "Distribution Specialist", "role": "Scale Engine",
+     "description": "Phone farm automation, distribution sauce, scaling operations.",
+     "capabilities": ["automate", "scale", "distribute"],
+     "allowed_actions": ["add_insight", "trigger_automation", "report_distribution"],
+     "model_provider": "openai", "model_id": "gpt-4o-mini", "schedule_interval_minutes": 90},
+    
+    {"id": "researcher", "name": "Content Researcher", "role": "Research",
+     "description": "Content research, trend analysis, competitor monitoring.",
+     "capabilities": ["research", "analyze", "monitor"],
+     "allowed_actions": ["add_insight", "create_report"],
+     "model_provider": "openai", "model_id": "gpt-4o-mini", "schedule_interval_minutes": 120}
+]')
 ON CONFLICT (id) DO UPDATE SET
     name = EXCLUDED.name,
     role = EXCLUDED.role,